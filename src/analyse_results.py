@@ -2,6 +2,12 @@ import csv
 import matplotlib.pyplot as plt
 from comparaison import Resultats
 
+def _entier(s):
+    '''
+    Nombre de points d'une ligne, None si la méthode n'a pas abouti (timeout)
+    '''
+    return int(s) if s else None
+
 def from_csv(path):
         res = Resultats()
         try:
@@ -13,9 +19,9 @@ def from_csv(path):
                         int(row["p"]),
                         float(row["t_ind"]),
                         float(row["t_dir"]),
-                        int(row["pareto_count"]),
-                        int(row["lorenz_ind_count"]),
-                        int(row["lorenz_dir_count"]),
+                        _entier(row["pareto_count"]),
+                        _entier(row["lorenz_ind_count"]),
+                        _entier(row["lorenz_dir_count"]),
                     )
         except OSError as e:
             print(f"[ERREUR] Lecture CSV impossible: {e}")
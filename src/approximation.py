@@ -0,0 +1,80 @@
+'''
+Mode approché de la méthode indirecte (methode_indirecte(..., epsilon=...)) : qualité et gains
+
+Garantie : pour tout point Lorenz non dominé y, le résultat approché contient z avec L(z) >= L(y) / (1+epsilon).
+couverture mesure le epsilon atteint en pratique (souvent bien plus petit que celui demandé),
+rapport compare temps, nb d'états et mémoire (cf. tracing.py) avec la méthode exacte.
+
+    python approximation.py
+'''
+
+import time
+
+import numpy as np
+
+from instance import read_instance, lorenz_vectors
+from indirecte import pareto_dp, lorenz_filter
+from tracing import Trace
+
+TAILLE_BLOC = 1 << 20 # nb max de paires (exact, approché) comparées à la fois
+
+def couverture(exacts, approches):
+    '''
+    Plus petit epsilon tel que chaque point de exacts soit couvert par un point de approches :
+    max sur y de exacts, min sur z de approches, max sur k de L(y)_k / L(z)_k, moins 1
+    (0 si tous les vecteurs de Lorenz exacts sont retrouvés)
+    '''
+    Ly = lorenz_vectors(np.asarray(exacts, dtype=np.int64)).astype(float)
+    Lz = lorenz_vectors(np.asarray(approches, dtype=np.int64)).astype(float)
+    if len(Ly) == 0:
+        return 0.0
+    if len(Lz) == 0:
+        return np.inf
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pire = 0.0
+        pas = max(1, TAILLE_BLOC // len(Lz))
+        for a in range(0, len(Ly), pas):
+            y = Ly[a:a + pas, None, :]
+            ratio = np.where(y > 0, y / Lz[None, :, :], 1.0) # L(y)_k = 0 est toujours couvert
+            pire = max(pire, ratio.max(axis=2).min(axis=1).max())
+    return pire - 1
+
+def _execute(instance, **options):
+    '''
+    Programmation dynamique (avec trace) puis filtre de Lorenz : (temps, points Lorenz, résumé de la trace)
+    '''
+    trace = Trace()
+    start = time.perf_counter()
+    lorenz_points = lorenz_filter(pareto_dp(instance, trace=trace, **options))
+    return time.perf_counter() - start, lorenz_points, trace.resume()
+
+def rapport(instance, epsilons=(0.01, 0.1, 0.3), dominance="bucket"):
+    '''
+    Pour chaque epsilon : epsilon atteint, taille du front de Lorenz, gains de temps, d'états et de mémoire
+    par rapport à la méthode exacte. Renvoie la liste des lignes (dict)
+    '''
+    t_exact, exact, r_exact = _execute(instance, dominance=dominance)
+    print(f"exact : {t_exact:.2f}s, {len(exact)} points Lorenz, {r_exact['max_etats']} états max, "
+          f"{r_exact['max_octets'] / 1e6:.1f}Mo")
+    print(f"{'epsilon':>8} {'atteint':>9} {'#lorenz':>8} {'temps':>8} {'gain':>6} {'états max':>10} {'gain':>6} {'mémoire':>9}")
+
+    lignes = []
+    for eps in epsilons:
+        temps, approx, r = _execute(instance, dominance=dominance, epsilon=eps)
+        ligne = {"epsilon": eps, "atteint": couverture(exact, approx), "nb_lorenz": len(approx),
+                 "nb_lorenz_exact": len(exact), "temps": temps, "temps_exact": t_exact,
+                 "max_etats": r["max_etats"], "max_etats_exact": r_exact["max_etats"],
+                 "max_octets": r["max_octets"], "max_octets_exact": r_exact["max_octets"]}
+        lignes.append(ligne)
+        print(f"{eps:>8} {ligne['atteint']:>9.5f} {len(approx):>8} {temps:>7.2f}s {t_exact / temps:>5.1f}x "
+              f"{r['max_etats']:>10} {r_exact['max_etats'] / max(r['max_etats'], 1):>5.1f}x {r['max_octets'] / 1e6:>7.1f}Mo")
+        assert ligne["atteint"] <= eps + 1e-9, "garantie d'approximation non respectée"
+    return lignes
+
+if __name__ == "__main__":
+
+    for n, p in [(100, 2), (40, 3), (30, 4), (30, 5), (25, 6)]:
+        print("---"*15)
+        print(f"{n = }, {p = }")
+        rapport(read_instance("Data/2KP200-TA-0.dat", n, p))
@@ -0,0 +1,195 @@
+'''
+Archive de points Pareto non dominés indexée par un ND-tree (Jaszkiewicz & Lust, 2018)
+
+Même sémantique que indirecte.pareto_insert (maximisation) :
+- un point déjà présent ou dominé n'est pas inséré
+- sinon il est inséré et les points qu'il domine sont supprimés
+
+Chaque noeud garde un majorant (ideal) et un minorant (nadir) des points de son sous-arbre,
+ce qui permet de ne visiter que les noeuds "proches" du point testé.
+'''
+
+TAILLE_FEUILLE = 20 # nb max de points dans une feuille avant découpage
+NB_FILS = 6 # nb de fils créés lors d'un découpage
+
+def _geq(u, v):
+    '''
+    u >= v composante par composante
+    '''
+    for a, b in zip(u, v):
+        if a < b:
+            return False
+    return True
+
+class _Noeud:
+    def __init__(self, points=None):
+        self.points = points if points is not None else [] # non vide seulement pour une feuille
+        self.fils = []
+        self.ideal = None
+        self.nadir = None
+        for y in self.points:
+            self.etend(y)
+
+    def feuille(self):
+        return not self.fils
+
+    def etend(self, y):
+        '''
+        Met à jour ideal et nadir avec le point y
+        '''
+        if self.ideal is None:
+            self.ideal = tuple(y)
+            self.nadir = tuple(y)
+        else:
+            self.ideal = tuple(max(a, b) for a, b in zip(self.ideal, y))
+            self.nadir = tuple(min(a, b) for a, b in zip(self.nadir, y))
+
+    def centre(self):
+        return [(a + b) / 2 for a, b in zip(self.ideal, self.nadir)]
+
+def _distance2(u, v):
+    return sum((a - b) ** 2 for a, b in zip(u, v))
+
+class ParetoArchive:
+    '''
+    Front de Pareto (maximisation) indexé par un ND-tree, adapté à 2 <= p <= 6
+    '''
+    def __init__(self, points=()):
+        self.racine = None
+        self.taille = 0
+        self.dernier = None # dernier point dominant trouvé, testé en premier
+        for y in points:
+            self.update(y)
+
+    def __len__(self):
+        return self.taille
+
+    def __iter__(self):
+        pile = [self.racine] if self.racine is not None else []
+        while pile:
+            noeud = pile.pop()
+            if noeud.feuille():
+                yield from noeud.points
+            else:
+                pile.extend(noeud.fils)
+
+    def points(self):
+        return list(self)
+
+    def dominated(self, y):
+        '''
+        True si y est faiblement dominé par un point de l'archive (ou déjà présent)
+        '''
+        # Les points arrivent souvent par paquets voisins : le dernier dominant est un bon candidat
+        if self.dernier is not None and _geq(self.dernier, y):
+            return True
+        pile = [self.racine] if self.racine is not None else []
+        while pile:
+            noeud = pile.pop()
+            if not _geq(noeud.ideal, y): # aucun point du sous-arbre ne peut dominer y
+                continue
+            if _geq(noeud.nadir, y): # tous les points du sous-arbre dominent y
+                return True
+            if noeud.feuille():
+                for z in noeud.points:
+                    if _geq(z, y):
+                        self.dernier = z
+                        return True
+            else:
+                pile.extend(noeud.fils)
+        return False
+
+    def update(self, y):
+        '''
+        Insère y s'il n'est pas dominé et supprime les points qu'il domine
+        Renvoie True si y a été inséré
+        '''
+        y = tuple(y)
+        if self.racine is None:
+            self.racine = _Noeud([y])
+            self.taille = 1
+            return True
+
+        if self.dominated(y):
+            return False
+
+        self._supprime_domines(self.racine, y)
+        if self.dernier is not None and _geq(y, self.dernier):
+            self.dernier = None # il vient d'être supprimé
+        if self.racine.ideal is None: # tout a été supprimé
+            self.racine = _Noeud([y])
+            self.taille = 1
+            return True
+        while not self.racine.feuille() and len(self.racine.fils) == 1:
+            self.racine = self.racine.fils[0]
+
+        self._insere(self.racine, y)
+        self.taille += 1
+        return True
+
+    def _supprime_domines(self, noeud, y):
+        '''
+        Supprime du sous-arbre les points dominés par y (y n'est dominé par aucun point)
+        '''
+        if not _geq(y, noeud.nadir): # y ne domine aucun point du sous-arbre
+            return
+        if _geq(y, noeud.ideal): # y domine tout le sous-arbre
+            self.taille -= sum(1 for _ in self._points_de(noeud))
+            noeud.points, noeud.fils = [], []
+            noeud.ideal = noeud.nadir = None
+            return
+
+        if noeud.feuille():
+            garde = [z for z in noeud.points if not _geq(y, z)]
+            self.taille -= len(noeud.points) - len(garde)
+            noeud.points = garde
+            if not garde:
+                noeud.ideal = noeud.nadir = None
+        else:
+            for f in noeud.fils:
+                self._supprime_domines(f, y)
+            noeud.fils = [f for f in noeud.fils if f.ideal is not None]
+            if not noeud.fils:
+                noeud.ideal = noeud.nadir = None
+            elif len(noeud.fils) == 1: # on remonte le fils unique
+                f = noeud.fils[0]
+                noeud.points, noeud.fils, noeud.ideal, noeud.nadir = f.points, f.fils, f.ideal, f.nadir
+
+    def _points_de(self, noeud):
+        pile = [noeud]
+        while pile:
+            n = pile.pop()
+            if n.feuille():
+                yield from n.points
+            else:
+                pile.extend(n.fils)
+
+    def _insere(self, noeud, y):
+        noeud.etend(y)
+        if noeud.feuille():
+            noeud.points.append(y)
+            if len(noeud.points) > TAILLE_FEUILLE:
+                self._decoupe(noeud)
+            return
+        # On descend dans le fils dont le centre est le plus proche de y
+        fils = min(noeud.fils, key=lambda f: _distance2(f.centre(), y))
+        self._insere(fils, y)
+
+    def _decoupe(self, noeud):
+        '''
+        Transforme une feuille trop pleine en noeud interne à NB_FILS fils
+        Les graines sont choisies éloignées les unes des autres, puis chaque point va à la graine la plus proche
+        '''
+        pts = noeud.points
+        centre = [sum(c) / len(pts) for c in zip(*pts)]
+        graines = [max(pts, key=lambda z: _distance2(z, centre))]
+        while len(graines) < NB_FILS:
+            graines.append(max(pts, key=lambda z: min(_distance2(z, g) for g in graines)))
+
+        groupes = [[] for _ in graines]
+        for z in pts:
+            k = min(range(len(graines)), key=lambda k: _distance2(z, graines[k]))
+            groupes[k].append(z)
+
+        noeud.fils = [_Noeud(g) for g in groupes if g]
+        noeud.points = []
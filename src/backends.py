@@ -0,0 +1,462 @@
+'''
+Solveurs PLNE pour la méthode directe
+
+Chaque backend gère le PL OWA d'une instance :
+- construction du PL de base (variables x, r, b, objectif OWA, linéarisation, capacité)
+- ajout d'une contrainte d'amélioration pour un vecteur de Lorenz déjà trouvé
+- résolution (avec limite de temps éventuelle), lecture des objets sélectionnés et de la borne du PLNE
+
+Backends disponibles :
+- "gurobi" : gurobipy (licence Gurobi nécessaire)
+- "pulp"   : PuLP (CBC avec solution de départ par défaut, cf. solveur_pulp)
+- "scipy"  : scipy.optimize.milp (HiGHS appelé en mémoire, sans licence)
+'''
+
+import numpy as np
+
+from instance import lorenz_vector
+
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:
+    gp = None
+
+try:
+    import pulp
+except ImportError:
+    pulp = None
+
+try:
+    from scipy.optimize import milp, LinearConstraint, Bounds
+    from scipy.sparse import coo_matrix
+except ImportError:
+    milp = None
+
+# Statuts renvoyés par Backend.solve
+OPTIMAL = "optimal"
+INFEASIBLE = "infeasible"
+LIMITE = "time_limit" # limite de temps atteinte avant de prouver l'optimalité
+AUTRE = "other"
+
+def poids_lambda(omega):
+    '''
+    Poids lambda de la décomposition de l'OWA en somme de composantes de Lorenz
+    '''
+    p = len(omega)
+    return [omega[i] - omega[i+1] for i in range(p-1)] + [omega[p-1]]
+
+class Backend:
+    '''
+    Interface commune des backends
+    '''
+    nom = None
+
+    def __init__(self, instance, omega):
+        self.instance = instance
+        self.lambdas = poids_lambda(omega)
+        self.coupes = [] # vecteurs de Lorenz des contraintes d'amélioration
+
+    @classmethod
+    def disponible(cls):
+        return False
+
+    def add_cut(self, Ls):
+        '''
+        Ajoute la contrainte d'amélioration : L(y)_k >= Ls_k + 1 pour au moins un k
+        '''
+        raise NotImplementedError
+
+    def solve(self):
+        '''
+        Résout le PL, renvoie OPTIMAL, INFEASIBLE, LIMITE ou AUTRE
+        '''
+        raise NotImplementedError
+
+    def set_time_limit(self, secondes):
+        '''
+        Limite de temps des prochaines résolutions (None : pas de limite)
+        '''
+        raise NotImplementedError
+
+    def borne(self):
+        '''
+        Majorant de la valeur OWA optimale prouvé par la dernière résolution
+        (valeur optimale si OPTIMAL, None si le solveur ne la donne pas)
+        '''
+        return None
+
+    def selection(self):
+        '''
+        Objets sélectionnés dans la dernière solution
+        '''
+        raise NotImplementedError
+
+    def restrict_total(self, lo, hi):
+        '''
+        Restreint le PL aux solutions dont la somme des objectifs (dernière composante de Lorenz) est dans [lo, hi]
+        '''
+        raise NotImplementedError
+
+    def set_pool(self, k):
+        '''
+        Demande au solveur de garder jusqu'à k solutions par résolution (si le solveur le permet)
+        '''
+        pass
+
+    def selections(self):
+        '''
+        Objets sélectionnés dans toutes les solutions gardées lors de la dernière résolution
+        (la première est la solution optimale)
+        '''
+        return [self.selection()]
+
+class GurobiBackend(Backend):
+    nom = "gurobi"
+
+    def __init__(self, instance, omega, threads=None):
+        super().__init__(instance, omega)
+        n = instance.n #nb d'objets
+        p = instance.p #nb d'objectifs
+        weights = instance.weights_list
+        values = instance.values_list
+
+        model = gp.Model("OWA")
+        model.Params.OutputFlag = 0
+        if threads is not None:
+            model.Params.Threads = threads
+
+        # Variables
+        x = model.addVars(n, vtype=GRB.BINARY, name="x")
+        r = model.addVars(p, lb=-GRB.INFINITY, name="r")
+        b = model.addVars(p, p, lb=0, name="b")
+
+        # Fonction objectif
+        model.setObjective(gp.quicksum(self.lambdas[k] * ((k+1)*r[k] - gp.quicksum(b[k,i] for i in range(p))) for k in range(p)), GRB.MAXIMIZE)
+
+        #Contraintes
+        for k in range(p):
+            for i in range(p):
+                # rk - bik <= sum vij*xj pour i,k de 1 à p
+                model.addConstr( r[k] - b[k,i] <= gp.quicksum(values[j][i] * x[j] for j in range(n)))
+
+        # sum wi*xi <= W -> contrainte de capacité
+        model.addConstr(gp.quicksum(weights[j] * x[j] for j in range(n)) <= instance.capacity)
+
+        self.model, self.x, self.r, self.b = model, x, r, b
+
+    licence = None # résultat du test de licence (fait une seule fois)
+
+    @classmethod
+    def disponible(cls):
+        if gp is None:
+            return False
+        if cls.licence is None:
+            try: # il faut aussi une licence
+                gp.Model().dispose()
+                cls.licence = True
+            except gp.GurobiError:
+                cls.licence = False
+        return cls.licence
+
+    def add_cut(self, Ls):
+        # Solution de départ pour la prochaine résolution (cherchée avant de modifier le modèle)
+        self.coupes.append(tuple(Ls))
+        depart = self._depart_mip()
+
+        p = len(Ls)
+        s = len(self.coupes) - 1
+        z = self.model.addVars(p, vtype=GRB.BINARY, name=f"z_{s}")
+        for k in range(p):
+            # k*r[k] - sum b >= (Ls[k] + 1)*z[k]
+            self.model.addConstr((k+1)*self.r[k] - gp.quicksum(self.b[k,i] for i in range(p)) >= (Ls[k] + 1)*z[k])
+        self.model.addConstr(gp.quicksum(z[k] for k in range(p)) >= 1)
+
+        if depart is not None:
+            for j in range(self.instance.n):
+                self.x[j].Start = 1 if j in depart else 0
+
+    def _depart_mip(self):
+        '''
+        Cherche, parmi les solutions rencontrées par Gurobi lors de la résolution précédente,
+        une solution qui respecte toutes les contraintes d'amélioration (donc réalisable pour le nouveau PL)
+        Renvoie l'ensemble des objets sélectionnés ou None
+        '''
+        if self.model.SolCount == 0:
+            return None
+        for k in range(1, self.model.SolCount): # la solution 0 est l'optimum, exclu par la dernière contrainte
+            self.model.Params.SolutionNumber = k
+            selected = [j for j in range(self.instance.n) if self.x[j].Xn > 0.5]
+            L = lorenz_vector(self.instance.eval(selected))
+            if all(any(L[i] > Ls[i] for i in range(len(L))) for Ls in self.coupes):
+                return set(selected)
+        return None
+
+    def solve(self):
+        self.model.optimize()
+        if self.model.status == GRB.OPTIMAL:
+            return OPTIMAL
+        if self.model.status in (GRB.INFEASIBLE, GRB.INF_OR_UNBD):
+            return INFEASIBLE
+        if self.model.status == GRB.TIME_LIMIT:
+            return LIMITE
+        return AUTRE
+
+    def set_time_limit(self, secondes):
+        self.model.Params.TimeLimit = GRB.INFINITY if secondes is None else max(secondes, 0)
+
+    def borne(self):
+        if self.model.status in (GRB.OPTIMAL, GRB.TIME_LIMIT) and self.model.ObjBound < GRB.INFINITY:
+            return self.model.ObjBound
+        return None
+
+    def selection(self):
+        return [j for j in range(self.instance.n) if self.x[j].X > 0.5]
+
+    def restrict_total(self, lo, hi):
+        total = gp.quicksum(sum(self.instance.values_list[j]) * self.x[j] for j in range(self.instance.n))
+        self.model.addConstr(total >= lo)
+        self.model.addConstr(total <= hi)
+
+    def set_pool(self, k):
+        if k <= 0:
+            return
+        self.model.Params.PoolSolutions = k
+        self.model.Params.PoolSearchMode = 1 # cherche activement d'autres solutions
+
+    def selections(self):
+        res = []
+        for k in range(self.model.SolCount):
+            self.model.Params.SolutionNumber = k
+            res.append([j for j in range(self.instance.n) if self.x[j].Xn > 0.5])
+        return res
+
+class PulpBackend(Backend):
+    '''
+    solver: solveur PuLP (par défaut solveur_pulp())
+    PuLP ne garde pas de modèle dans le solveur entre deux résolutions : seul le PL Python (LpProblem)
+    est persistant, le solveur reçoit le modèle complet à chaque solve (fichier .mps et processus pour CBC,
+    modèle reconstruit par l'API pour Gurobi et HiGHS)
+    '''
+    nom = "pulp"
+
+    def __init__(self, instance, omega, solver=None):
+        super().__init__(instance, omega)
+        n = instance.n #nb d'objets
+        p = instance.p #nb d'objectifs
+        weights = instance.weights_list
+        values = instance.values_list
+
+        self.solver = solver if solver is not None else solveur_pulp()
+        prob = pulp.LpProblem("OWA", pulp.LpMaximize)
+
+        # Variables
+        x = [pulp.LpVariable(f"x_{j}", cat="Binary") for j in range(n)]
+        r = [pulp.LpVariable(f"r_{k}") for k in range(p)]
+        b = [[pulp.LpVariable(f"b_{k}_{i}", lowBound=0) for i in range(p)] for k in range(p)]
+
+        # Fonction objectif
+        prob += pulp.lpSum(self.lambdas[k] * ((k+1)*r[k] - pulp.lpSum(b[k][i] for i in range(p))) for k in range(p))  # k+1 car k de 1 à p mais de 0 à p-1 en python
+
+        #Contraintes
+        for k in range(p):
+            for i in range(p):
+                # rk - bik <= sum vij*xj pour i,k de 1 à p
+                prob += (r[k] - b[k][i] <= pulp.lpSum(values[j][i] * x[j] for j in range(n)))
+
+        # sum wi*xi <= W -> contrainte de capacité
+        prob += pulp.lpSum(weights[j] * x[j] for j in range(n)) <= instance.capacity
+
+        self.prob, self.x, self.r, self.b = prob, x, r, b
+
+    @classmethod
+    def disponible(cls):
+        return pulp is not None
+
+    def add_cut(self, Ls):
+        self.coupes.append(tuple(Ls))
+        p = len(Ls)
+        s = len(self.coupes) - 1
+        z = [pulp.LpVariable(f"z_{s}_{k}", cat="Binary") for k in range(p)]
+        for k in range(p):
+            # k*r[k] - sum b >= (Ls[k] + 1)*z[k]
+            self.prob += ((k+1)*self.r[k] - pulp.lpSum(self.b[k][i] for i in range(p))>= (Ls[k] + 1) * z[k])
+        self.prob += pulp.lpSum(z[k] for k in range(p)) >= 1
+
+        # Solution de départ : la solution précédente (le solveur la complète/répare si elle est rejetée).
+        # Utilisée par CBC et Gurobi, PuLP ne la passe pas à HiGHS
+        selected = set(self.selection())
+        for j in range(self.instance.n):
+            self.x[j].setInitialValue(1 if j in selected else 0)
+
+    def restrict_total(self, lo, hi):
+        total = pulp.lpSum(sum(self.instance.values_list[j]) * self.x[j] for j in range(self.instance.n))
+        self.prob += total >= lo
+        self.prob += total <= hi
+
+    def solve(self):
+        status = self.prob.solve(self.solver)
+        if status == pulp.LpStatusOptimal and self.prob.sol_status == pulp.LpSolutionOptimal:
+            return OPTIMAL
+        if status == pulp.LpStatusInfeasible:
+            return INFEASIBLE
+        if self.solver.timeLimit is not None and status in (pulp.LpStatusOptimal, pulp.LpStatusNotSolved):
+            return LIMITE # CBC et HiGHS renvoient la meilleure solution trouvée, Gurobi (via PuLP) rien
+        return AUTRE
+
+    def set_time_limit(self, secondes):
+        self.solver.timeLimit = None if secondes is None else max(secondes, 0)
+
+    def borne(self):
+        # PuLP ne donne pas la borne du branch and bound, seulement la valeur d'une solution optimale
+        if self.prob.status == pulp.LpStatusOptimal and self.prob.sol_status == pulp.LpSolutionOptimal:
+            return pulp.value(self.prob.objective)
+        return None
+
+    def selection(self):
+        return [j for j in range(self.instance.n) if (self.x[j].value() or 0) > 0.5]
+
+def solveur_pulp(msg=False):
+    '''
+    Choisit le solveur PuLP utilisé par défaut :
+    Gurobi appelé en mémoire (gurobipy, pas de fichier ni de processus) s'il est installé,
+    sinon CBC avec solution de départ (warmStart : la solution précédente, cf. PulpBackend.add_cut).
+    HiGHS (highspy) est aussi appelé en mémoire, mais PuLP ne lui passe pas de solution de départ et ses
+    résolutions sont plus lentes que celles de CBC sur ce PL (2KP200, n=40 p=3 : 3.0s contre 1.2s) :
+    on ne le prend que si on le demande (solver=pulp.HiGHS(msg=False))
+    '''
+    if GurobiBackend.disponible():
+        return pulp.GUROBI(msg=msg, warmStart=True)
+    return pulp.PULP_CBC_CMD(msg=msg, warmStart=True)
+
+class ScipyBackend(Backend):
+    '''
+    PL écrit sous forme matricielle pour scipy.optimize.milp
+    Variables : x (n), r (p), b (p*p), puis z (p) pour chaque contrainte d'amélioration
+    Les lignes de contraintes sont gardées et complétées à chaque ajout
+    '''
+    nom = "scipy"
+
+    def __init__(self, instance, omega):
+        super().__init__(instance, omega)
+        n = instance.n #nb d'objets
+        p = instance.p #nb d'objectifs
+        values = np.asarray(instance.values, dtype=float).reshape(n, p)
+
+        self.nb_var = n + p + p*p
+        self.lignes, self.colonnes, self.coefs = [], [], []
+        self.bas, self.haut = [], []
+
+        #Contraintes : rk - bik - sum vij*xj <= 0
+        for k in range(p):
+            for i in range(p):
+                self._ligne([self._r(k), self._b(k, i)] + list(range(n)), [1.0, -1.0] + list(-values[:, i]), -np.inf, 0.0)
+
+        # sum wi*xi <= W -> contrainte de capacité
+        self._ligne(list(range(n)), [float(w) for w in instance.weights], -np.inf, float(instance.capacity))
+
+        # Fonction objectif (milp minimise)
+        self.c = np.zeros(self.nb_var)
+        for k in range(p):
+            self.c[self._r(k)] -= self.lambdas[k] * (k+1)
+            for i in range(p):
+                self.c[self._b(k, i)] += self.lambdas[k]
+
+        self.res = None
+        self.time_limit = None
+
+    @classmethod
+    def disponible(cls):
+        return milp is not None
+
+    def _r(self, k):
+        return self.instance.n + k
+
+    def _b(self, k, i):
+        return self.instance.n + self.instance.p + k*self.instance.p + i
+
+    def _ligne(self, cols, coefs, bas, haut):
+        i = len(self.bas)
+        self.lignes += [i] * len(cols)
+        self.colonnes += list(cols)
+        self.coefs += list(coefs)
+        self.bas.append(bas)
+        self.haut.append(haut)
+
+    def add_cut(self, Ls):
+        self.coupes.append(tuple(Ls))
+        p = len(Ls)
+        z0 = self.nb_var
+        self.nb_var += p
+        self.c = np.concatenate((self.c, np.zeros(p)))
+        for k in range(p):
+            # k*r[k] - sum b - (Ls[k] + 1)*z[k] >= 0
+            cols = [self._r(k)] + [self._b(k, i) for i in range(p)] + [z0 + k]
+            self._ligne(cols, [k+1.0] + [-1.0]*p + [-(Ls[k] + 1.0)], 0.0, np.inf)
+        self._ligne([z0 + k for k in range(p)], [1.0]*p, 1.0, np.inf)
+
+    def restrict_total(self, lo, hi):
+        n = self.instance.n
+        self._ligne(list(range(n)), self.instance.values.sum(axis=1).astype(float).tolist(), float(lo), float(hi))
+
+    def solve(self):
+        n, p = self.instance.n, self.instance.p
+        A = coo_matrix((self.coefs, (self.lignes, self.colonnes)), shape=(len(self.bas), self.nb_var)).tocsr()
+
+        entier = np.zeros(self.nb_var)
+        entier[:n] = 1
+        entier[n + p + p*p:] = 1
+        bas = np.zeros(self.nb_var)
+        haut = np.ones(self.nb_var)
+        bas[n:n+p] = -np.inf # r libres
+        haut[n:n + p + p*p] = np.inf
+
+        self.res = milp(self.c, constraints=LinearConstraint(A, self.bas, self.haut),
+                        integrality=entier, bounds=Bounds(bas, haut),
+                        options={} if self.time_limit is None else {"time_limit": self.time_limit})
+        if self.res.status == 0:
+            return OPTIMAL
+        if self.res.status == 2:
+            return INFEASIBLE
+        if self.res.status == 1:
+            return LIMITE
+        return AUTRE
+
+    def set_time_limit(self, secondes):
+        self.time_limit = None if secondes is None else max(secondes, 0)
+
+    def borne(self):
+        # milp minimise -OWA
+        borne = getattr(self.res, "mip_dual_bound", None)
+        if borne is None or not np.isfinite(borne):
+            return None
+        return -borne
+
+    def selection(self):
+        return [j for j in range(self.instance.n) if self.res.x[j] > 0.5]
+
+# Ordre de préférence quand aucun backend n'est demandé, du plus rapide au plus lent sur ce PL.
+# scipy (HiGHS) évite le processus CBC mais n'a pas de solution de départ : ses énumérations sont plus lentes
+# que celles de pulp/CBC (2KP200, n=40 p=3 : 3.4s contre 1.2s ; n=30 p=4 : 1.1s contre 0.26s)
+BACKENDS = {
+    "gurobi": GurobiBackend,
+    "pulp": PulpBackend,
+    "scipy": ScipyBackend,
+}
+
+def choix_backend(backend=None):
+    '''
+    backend: nom ("gurobi", "scipy", "pulp"), classe de backend, ou None
+    Avec None, on prend le premier backend installé dans l'ordre de BACKENDS
+    Renvoie la classe du backend
+    '''
+    if backend is None:
+        for cls in BACKENDS.values():
+            if cls.disponible():
+                return cls
+        raise RuntimeError("Aucun solveur PLNE disponible (gurobipy, scipy ou pulp)")
+    if isinstance(backend, str):
+        backend = BACKENDS[backend]
+    if not backend.disponible():
+        raise RuntimeError(f"Le backend {backend.nom} n'est pas disponible")
+    return backend
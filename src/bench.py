@@ -0,0 +1,189 @@
+'''
+Suite de benchmarks reproductible des 2 méthodes, avec suivi des régressions
+
+    python bench.py run rapide                      -> Resultats/Bench/rapide_<date>.json
+    python bench.py run complet --reps 7 --warmup 2
+    python bench.py compare ancien.json nouveau.json
+
+Pour chaque cas d'un scénario :
+- warmup exécutions non mesurées, puis reps exécutions chronométrées -> médiane et écart interquartile
+- une exécution de plus sous tracemalloc pour le pic mémoire (pas dans les temps : tracemalloc ralentit)
+- chaque cas est mesuré dans un nouveau processus : son pic de mémoire résidente (RSS) ne dépend pas des cas précédents
+- nombre de résolutions du PLNE (directe) ou d'états de la programmation dynamique (indirecte)
+Le JSON contient aussi l'environnement (versions, machine, commit git, solveurs disponibles).
+'''
+
+import os
+import sys
+import json
+import argparse
+import platform
+import resource
+import subprocess
+import tracemalloc
+import multiprocessing
+from datetime import datetime
+
+import numpy as np
+
+from instance import read_instance
+from comparaison import run_indirecte, run_directe
+from omega_test import omega_exp
+from tracing import Trace
+from backends import BACKENDS
+
+FICHIER = "Data/2KP200-TA-0.dat"
+LAMBDA = 0.5 # omega de la méthode directe : omega_exp(p, LAMBDA)
+
+def cas(methode, n, p, **options):
+    return {"nom": f"{methode} n={n} p={p}" + "".join(f" {k}={v}" for k, v in options.items()),
+            "methode": methode, "n": n, "p": p, "options": options}
+
+SCENARIOS = {
+    "rapide": [cas("indirecte", 60, 2), cas("indirecte", 30, 3), cas("indirecte", 20, 4),
+               cas("directe", 60, 2), cas("directe", 30, 3), cas("directe", 20, 4)],
+    "indirecte": [cas("indirecte", 100, 2), cas("indirecte", 40, 3), cas("indirecte", 30, 4),
+                  cas("indirecte", 25, 5), cas("indirecte", 20, 6),
+                  cas("indirecte", 30, 4, dominance="weight"), cas("indirecte", 40, 3, lorenz_bound=True)],
+    "directe": [cas("directe", 100, 2), cas("directe", 50, 3), cas("directe", 40, 4),
+                cas("directe", 30, 5), cas("directe", 25, 6)],
+}
+SCENARIOS["complet"] = SCENARIOS["indirecte"] + SCENARIOS["directe"]
+
+def _execute(c, instance):
+    '''
+    Une exécution d'un cas : (temps, nb de points Lorenz, itérations)
+    itérations : résolutions du PLNE (directe), None pour l'indirecte (cf. _compte_etats)
+    '''
+    if c["methode"] == "indirecte":
+        temps, _, lor = run_indirecte(instance, **c["options"])
+        return temps, len(lor), None
+    temps, dir, nb = run_directe(instance, omega_exp(c["p"], LAMBDA), **c["options"])
+    return temps, len(dir), nb
+
+def _compte_etats(c, instance):
+    '''
+    Nombre total d'états créés par la programmation dynamique (somme sur les objets, cf. tracing.py)
+    '''
+    from indirecte import pareto_dp
+    options = {k: v for k, v in c["options"].items() if k in ("dominance", "lorenz_bound")}
+    trace = Trace()
+    pareto_dp(instance, trace=trace, **options)
+    return sum(trace.colonne("candidats"))
+
+def mesure(c, reps=5, warmup=1):
+    '''
+    Mesure un cas : médiane et écart interquartile des temps, pic mémoire, itérations
+    '''
+    instance = read_instance(FICHIER, c["n"], c["p"])
+    for _ in range(warmup):
+        _execute(c, instance)
+
+    temps = []
+    for _ in range(reps):
+        t, nb_points, iterations = _execute(c, instance)
+        temps.append(t)
+
+    tracemalloc.start()
+    _execute(c, instance)
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    if iterations is None:
+        iterations = _compte_etats(c, instance)
+
+    q1, med, q3 = np.percentile(temps, [25, 50, 75])
+    return {**c, "temps": temps, "mediane": med, "q1": q1, "q3": q3, "iqr": q3 - q1,
+            "pic_tracemalloc": pic,
+            "rss_max_ko": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, # max depuis le début du processus
+            "iterations": iterations, "nb_lorenz": nb_points}
+
+def mesure_isolee(c, reps=5, warmup=1):
+    '''
+    mesure(c, reps, warmup) dans un nouveau processus (spawn) : rss_max_ko est alors le pic du cas seul
+    (solveur en mémoire compris, sans les processus lancés par le solveur, ex: CBC)
+    '''
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(mesure, (c, reps, warmup))
+
+def environnement():
+    '''
+    Informations pour savoir dans quelles conditions les temps ont été mesurés
+    '''
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.platform(), "processeur": platform.processor(), "coeurs": os.cpu_count(),
+            "commit": commit,
+            "backends": [nom for nom, cls in BACKENDS.items() if cls.disponible()]}
+
+def run_scenario(nom, reps=5, warmup=1, out=None):
+    '''
+    Exécute tous les cas du scénario et écrit le JSON (par défaut Resultats/Bench/<nom>_<date>.json)
+    '''
+    res = {"scenario": nom, "reps": reps, "warmup": warmup, "environnement": environnement(), "cas": []}
+    print(f"{'cas':<42} {'médiane':>9} {'iqr':>8} {'mémoire':>10} {'rss max':>10} {'itérations':>11}")
+    for c in SCENARIOS[nom]:
+        r = mesure_isolee(c, reps, warmup)
+        res["cas"].append(r)
+        print(f"{r['nom']:<42} {r['mediane']:>8.3f}s {r['iqr']:>7.3f}s {r['pic_tracemalloc'] / 1e6:>8.1f}Mo "
+              f"{r['rss_max_ko'] / 1e3:>8.1f}Mo {r['iterations']:>11}")
+
+    if out is None:
+        out = f"Resultats/Bench/{nom}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(res, f, indent=1)
+    print(f"Résultats : {out}")
+    return res
+
+def compare(ancien, nouveau, seuil=0.10):
+    '''
+    Compare deux fichiers JSON de run_scenario, cas par cas (même nom)
+    Une régression : médiane plus lente de plus de seuil, et au-delà du 3e quartile de l'ancien run
+    Renvoie la liste des cas en régression
+    '''
+    with open(ancien) as f:
+        A = {c["nom"]: c for c in json.load(f)["cas"]}
+    with open(nouveau) as f:
+        B = {c["nom"]: c for c in json.load(f)["cas"]}
+
+    regressions = []
+    print(f"{'cas':<42} {'ancien':>9} {'nouveau':>9} {'écart':>8}")
+    for nom in [nom for nom in A if nom in B]:
+        a, b = A[nom], B[nom]
+        ecart = b["mediane"] / a["mediane"] - 1 if a["mediane"] > 0 else 0.0
+        regression = ecart > seuil and b["mediane"] > a["q3"]
+        if regression:
+            regressions.append(nom)
+        amelioration = ecart < -seuil and b["mediane"] < a["q1"]
+        bilan = "REGRESSION" if regression else ("mieux" if amelioration else "")
+        print(f"{nom:<42} {a['mediane']:>8.3f}s {b['mediane']:>8.3f}s {ecart:>+7.1%}  {bilan}")
+        if a["nb_lorenz"] != b["nb_lorenz"]:
+            print(f"   /!\\ nombre de points de Lorenz différent : {a['nb_lorenz']} -> {b['nb_lorenz']}")
+    for nom in sorted(A.keys() ^ B.keys()):
+        print(f"{nom:<42} présent dans un seul des deux fichiers")
+    return regressions
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmarks des méthodes directe et indirecte")
+    sub = parser.add_subparsers(dest="commande", required=True)
+    r = sub.add_parser("run")
+    r.add_argument("scenario", choices=list(SCENARIOS))
+    r.add_argument("--reps", type=int, default=5)
+    r.add_argument("--warmup", type=int, default=1)
+    r.add_argument("--out")
+    c = sub.add_parser("compare")
+    c.add_argument("ancien")
+    c.add_argument("nouveau")
+    c.add_argument("--seuil", type=float, default=0.10)
+    args = parser.parse_args()
+
+    if args.commande == "run":
+        run_scenario(args.scenario, args.reps, args.warmup, args.out)
+    else:
+        sys.exit(1 if compare(args.ancien, args.nouveau, args.seuil) else 0)
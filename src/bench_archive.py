@@ -0,0 +1,83 @@
+'''
+Micro-benchmark : insertion dans un front de Pareto
+liste (indirecte.pareto_insert) vs ND-tree (archive.ParetoArchive)
+(et filtre par tri skyline.skyline quand tous les points sont connus d'avance)
+
+- points aléatoires proches d'un simplexe (gros fronts) pour p de 2 à 6
+- états de la table de programmation dynamique d'une instance du fichier Data
+'''
+
+import random
+import time
+
+import numpy as np
+
+from instance import read_instance
+from indirecte import pareto_insert, pareto_dp
+from archive import ParetoArchive
+from skyline import skyline
+import indirecte
+
+def points_simplexe(m, p, seed=0):
+    '''
+    m points entiers tirés près du simplexe sum = 1000 (beaucoup de points non dominés)
+    '''
+    rng = random.Random(seed)
+    points = []
+    for _ in range(m):
+        x = [rng.random() for _ in range(p)]
+        s = sum(x)
+        points.append(tuple(int(1000 * v / s * rng.uniform(0.9, 1.0)) for v in x))
+    return points
+
+def etats_dp(n, p, file="Data/2KP200-TA-0.dat"):
+    '''
+    Vecteurs de tous les états de la table dp (entrée de la fusion finale de pareto_dp)
+    '''
+    etats = []
+    ancien = indirecte.skyline
+    def capture(vals):
+        etats[:] = [tuple(v) for v in vals.tolist()]
+        return ancien(vals)
+    indirecte.skyline = capture
+    try:
+        pareto_dp(read_instance(file, n, p))
+    finally:
+        indirecte.skyline = ancien
+    return etats
+
+def temps_liste(points):
+    start = time.perf_counter()
+    front = []
+    for y in points:
+        front = pareto_insert(front, y)
+    return time.perf_counter() - start, len(front)
+
+def temps_archive(points):
+    start = time.perf_counter()
+    front = ParetoArchive()
+    for y in points:
+        front.update(y)
+    return time.perf_counter() - start, len(front)
+
+def temps_skyline(points):
+    start = time.perf_counter()
+    front = skyline(np.array(points))
+    return time.perf_counter() - start, len(front)
+
+def compare(nom, points):
+    t_l, k_l = temps_liste(points)
+    t_a, k_a = temps_archive(points)
+    t_s, k_s = temps_skyline(points)
+    assert k_l == k_a == k_s
+    print(f"{nom:<22} {len(points):>8} {k_a:>7} {t_l:>9.3f}s {t_a:>9.3f}s {t_s:>9.3f}s  x{t_l / max(t_a, 1e-9):.1f}")
+
+if __name__ == "__main__":
+
+    print(f"{'jeu':<22} {'#points':>8} {'#front':>7} {'liste':>10} {'nd-tree':>10} {'skyline':>10}")
+
+    for p in range(2, 7):
+        compare(f"simplexe p={p}", points_simplexe(3000, p))
+
+    for n, p in [(40, 3), (30, 4), (20, 5), (20, 6)]:
+        compare(f"dp n={n} p={p}", etats_dp(n, p))
@@ -0,0 +1,88 @@
+'''
+Cas bi-objectif (p = 2) de la méthode indirecte
+
+Pour p = 2, un front trié par v1 décroissant a ses v2 strictement croissants :
+- le filtre Pareto d'une liste triée est un simple maximum cumulé sur v2
+- deux fronts triés se fusionnent en temps linéaire (pas de comparaisons deux à deux)
+- le vecteur de Lorenz d'un point est (min, somme)
+'''
+
+import numpy as np
+
+def _cles(poids, vals):
+    '''
+    Clé entière unique respectant l'ordre (poids croissant, v1 décroissant, v2 décroissant)
+    Renvoie None si la clé ne tient pas sur 63 bits
+    '''
+    if len(poids) == 0:
+        return np.zeros(0, dtype=np.int64)
+    bits = max(int(vals.max()).bit_length(), 1)
+    if int(poids.max()).bit_length() + 2 * bits > 62:
+        return None
+    M = (1 << bits) - 1
+    return (poids << (2 * bits)) | ((M - vals[:, 0]) << bits) | (M - vals[:, 1])
+
+def _ordre_fusion(poids, vals, n_a):
+    '''
+    poids, vals: concaténation de deux tables triées (poids croissant, v1 décroissant, v2 décroissant),
+                 la première de taille n_a
+    Renvoie la permutation qui trie la concaténation (fusion linéaire des deux listes)
+    '''
+    cles = _cles(poids, vals)
+    if cles is None: # valeurs trop grandes pour une clé entière -> tri classique
+        return np.lexsort((-vals[:, 1], -vals[:, 0], poids))
+
+    ka, kb = cles[:n_a], cles[n_a:]
+    ordre = np.empty(len(cles), dtype=np.int64)
+    ordre[np.arange(len(ka)) + np.searchsorted(kb, ka, side="left")] = np.arange(len(ka))
+    ordre[np.arange(len(kb)) + np.searchsorted(ka, kb, side="right")] = n_a + np.arange(len(kb))
+    return ordre
+
+def _non_domines_tries(groupes, v2):
+    '''
+    groupes (croissant), v2: vecteurs triés par groupe puis v1 décroissant, v2 décroissant
+    Un vecteur est gardé ssi son v2 dépasse strictement celui de tous les précédents de son groupe
+    (cela supprime aussi les doublons)
+    '''
+    if len(v2) == 0:
+        return np.zeros(0, dtype=bool)
+    base = int(v2.max()) + 1
+    cle = groupes * base + v2 # croissant avec le groupe : un seul maximum cumulé suffit
+    prec = np.empty_like(cle)
+    prec[0] = -1
+    prec[1:] = np.maximum.accumulate(cle)[:-1]
+    return cle > np.maximum(prec, groupes * base - 1)
+
+def filtre_groupes_bi(poids, vals, n_a, trace=None):
+    '''
+    Filtre Pareto dans chaque dp[w] pour p = 2
+    poids, vals: concaténation des anciens états (n_a premiers) et des états décalés, chacun trié
+    Renvoie les indices gardés, triés par poids croissant puis v1 décroissant
+    trace: si donnée, on y compte les comparaisons (une par vecteur avec le maximum courant)
+    '''
+    if trace is not None:
+        trace.comparaisons += len(poids)
+    ordre = _ordre_fusion(poids, vals, n_a)
+    garde = _non_domines_tries(poids[ordre], vals[ordre, 1])
+    return ordre[garde]
+
+def front_bi(vals):
+    '''
+    Indices des vecteurs Pareto non dominés (un seul exemplaire des doublons) pour p = 2
+    '''
+    ordre = np.lexsort((-vals[:, 1], -vals[:, 0]))
+    garde = _non_domines_tries(np.zeros(len(ordre), dtype=np.int64), vals[ordre, 1])
+    return ordre[garde]
+
+def lorenz_masque_bi(points):
+    '''
+    Masque des points dont le vecteur de Lorenz est non dominé pour p = 2 : le vecteur de Lorenz de (y1, y2) est (min, somme)
+    '''
+    if len(points) == 0:
+        return np.zeros(0, dtype=bool)
+    Y = np.asarray(points, dtype=np.int64)
+    L = np.stack((Y.min(axis=1), Y.sum(axis=1)), axis=1)
+
+    front = L[front_bi(L)]
+    dans_front = set(map(tuple, front.tolist()))
+    return np.array([tuple(l) in dans_front for l in L.tolist()], dtype=bool)
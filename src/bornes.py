@@ -0,0 +1,96 @@
+'''
+Bornes pour élaguer la programmation dynamique de la méthode indirecte:
+
+- borne optimiste de complétion d'un état partiel (sac à dos fractionnaire par objectif sur les objets restants)
+- solutions réalisables (gloutonnes) pour initialiser le front de Lorenz des solutions connues
+'''
+
+import numpy as np
+
+from instance import lorenz_vectors
+from skyline import skyline
+
+class BornesCompletion:
+    '''
+    Pour chaque i et chaque objectif j, prépare le sac à dos fractionnaire
+    sur les objets restants i, ..., n-1 (triés par v_j/w décroissant)
+    '''
+    def __init__(self, instance):
+        self.n = instance.n
+        self.p = instance.p
+        weights = np.asarray(instance.weights, dtype=np.int64)
+        values = np.asarray(instance.values, dtype=np.int64).reshape(self.n, self.p)
+
+        # cum_w[i][j], cum_v[i][j] : sommes cumulées (précédées de 0) des objets restants triés
+        # ratio[i][j] : ratios triés (suivis de 0 pour les cas où tout rentre)
+        self.cum_w = []
+        self.cum_v = []
+        self.ratio = []
+        for i in range(self.n + 1):
+            cw, cv, r = [], [], []
+            for j in range(self.p):
+                w, v = weights[i:], values[i:, j]
+                ordre = np.argsort(-v / w, kind="stable")
+                cw.append(np.concatenate(([0], np.cumsum(w[ordre]))))
+                cv.append(np.concatenate(([0], np.cumsum(v[ordre]))))
+                r.append(np.concatenate((v[ordre] / w[ordre], [0.0])))
+            self.cum_w.append(cw)
+            self.cum_v.append(cv)
+            self.ratio.append(r)
+
+    def borne(self, i, vals, capa):
+        '''
+        vals: vecteurs des états (m, p) construits avec les objets 0, ..., i-1
+        capa: capacité restante de chaque état (m,)
+        Renvoie un majorant (m, p) de tout vecteur atteignable en complétant les états
+        '''
+        U = np.array(vals, dtype=np.int64)
+        for j in range(self.p):
+            cw, cv, r = self.cum_w[i][j], self.cum_v[i][j], self.ratio[i][j]
+            k = np.searchsorted(cw, capa, side="right") - 1 # nb d'objets pris entièrement
+            U[:, j] += cv[k] + np.floor((capa - cw[k]) * r[k]).astype(np.int64)
+        return U
+
+def solutions_gloutonnes(instance):
+    '''
+    Quelques solutions réalisables obtenues en remplissant le sac par ordre de v/w décroissant
+    (pour chaque objectif et pour la somme des objectifs)
+    Renvoie leurs vecteurs objectifs (k, p)
+    '''
+    weights = np.asarray(instance.weights, dtype=np.int64)
+    values = np.asarray(instance.values, dtype=np.int64).reshape(instance.n, instance.p)
+
+    criteres = [values[:, j] for j in range(instance.p)] + [values.sum(axis=1)]
+    solutions = []
+    for c in criteres:
+        w_sum = 0
+        y = np.zeros(instance.p, dtype=np.int64)
+        for i in np.argsort(-c / weights, kind="stable"):
+            if w_sum + weights[i] <= instance.capacity:
+                w_sum += weights[i]
+                y += values[i]
+        solutions.append(y)
+
+    return np.array(solutions)
+
+def lorenz_domine_strict(front, L):
+    '''
+    front: vecteurs de Lorenz de solutions connues (k, p)
+    L: vecteurs de Lorenz à tester (m, p)
+    Renvoie un masque sur L : True si L est Lorenz dominé (strictement) par un vecteur du front
+    '''
+    domine = np.zeros(len(L), dtype=bool)
+    for f in front:
+        domine |= np.all(L <= f, axis=1) & np.any(L < f, axis=1)
+    return domine
+
+def maj_front_lorenz(front, vals, k=256):
+    '''
+    Ajoute au front de Lorenz des solutions connues les k meilleurs états (somme des composantes de Lorenz)
+    Renvoie le nouveau front (vecteurs de Lorenz non dominés)
+    '''
+    L = lorenz_vectors(vals)
+    if len(L) > k:
+        L = L[np.argpartition(-L.sum(axis=1), k)[:k]]
+    L = np.concatenate((front, L))
+    return L[skyline(L)]
@@ -0,0 +1,168 @@
+'''
+Cache sur disque des résultats de methode_indirecte et enumerate_lorenz, partagé entre les scripts
+
+La clé d'un résultat est l'empreinte du contenu de l'instance (Instance.digest : poids, valeurs, capacité),
+la méthode et ses paramètres. Les paramètres qui ne changent pas le résultat n'en font pas partie
+(NEUTRES), en particulier omega pour la méthode directe : l'ensemble des vecteurs de Lorenz non dominés
+ne dépend pas de omega. Les temps, eux, en dépendent : l'entrée garde le omega du calcul, et les temps
+ne sont renvoyés que pour ce omega.
+
+    res = resultat_indirecte(instance)            # calculé une fois, puis relu
+    res = resultat_directe(instance, omega, bypass=True) # mesure de temps : toujours recalculé
+
+Chaque résultat est un fichier .npz (écriture atomique, cf. checkpoint.py) dans CACHE_DIR.
+Quand la taille totale dépasse taille_max, les résultats lus le moins récemment sont supprimés (LRU).
+'''
+
+import os
+import json
+import time
+import glob
+import hashlib
+
+import numpy as np
+
+from checkpoint import ecrit_npz, lit_npz
+from instance import selection_matrix
+from indirecte import methode_indirecte
+from direct import enumerate_lorenz
+
+CACHE_DIR = "Resultats/Cache"
+TAILLE_MAX = 500 * 2**20 # octets
+
+NEUTRES = {
+    "indirecte": {"verbose", "memory_budget", "checkpoint"},
+    "directe": {"omega", "verbose", "checkpoint", "persistent", "pool", "backend", "backend_options"},
+}
+
+class ResultCache:
+    '''
+    dossier: dossier des résultats (créé si besoin)
+    taille_max: taille totale max des fichiers (octets)
+    '''
+    def __init__(self, dossier=CACHE_DIR, taille_max=TAILLE_MAX):
+        self.dossier = dossier
+        self.taille_max = taille_max
+
+    def meta(self, instance, methode, **params):
+        '''
+        Description complète du calcul (sa clé est l'empreinte de cette description)
+        '''
+        params = {k: v for k, v in params.items() if k not in NEUTRES[methode]}
+        return json.loads(json.dumps({"instance": instance.digest(), "methode": methode, "params": params},
+                                     sort_keys=True))
+
+    def _path(self, meta):
+        cle = hashlib.sha1(json.dumps(meta, sort_keys=True).encode()).hexdigest()
+        return os.path.join(self.dossier, f"{meta['methode']}_{cle}.npz")
+
+    def get(self, meta):
+        '''
+        Tableaux enregistrés pour ce calcul, ou None
+        '''
+        path = self._path(meta)
+        try:
+            tableaux = lit_npz(path, meta)
+            if tableaux is not None:
+                os.utime(path) # date de dernière utilisation, pour l'éviction
+        except FileNotFoundError: # supprimé entre temps par l'éviction d'un autre processus
+            return None
+        except (OSError, ValueError, EOFError): # illisible
+            return None
+        return tableaux
+
+    def put(self, meta, **tableaux):
+        ecrit_npz(self._path(meta), meta, **tableaux)
+        self._evince()
+
+    def _evince(self):
+        fichiers = []
+        for path in glob.glob(os.path.join(self.dossier, "*.npz")):
+            try:
+                info = os.stat(path)
+            except OSError:
+                continue
+            fichiers.append((info.st_mtime, info.st_size, path))
+        total = sum(taille for _, taille, _ in fichiers)
+        for _, taille, path in sorted(fichiers):
+            if total <= self.taille_max:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= taille
+
+    def clear(self):
+        for path in glob.glob(os.path.join(self.dossier, "*.npz")):
+            os.remove(path)
+
+def _points(tableau):
+    return [tuple(v) for v in tableau.tolist()]
+
+def resultat_indirecte(instance, bypass=False, cache=None, verbose=False, **options):
+    '''
+    methode_indirecte(instance, verbose, **options) avec cache
+    bypass: si True, on recalcule toujours (mesures de temps) et on remplace le résultat du cache
+    cache: ResultCache (par défaut celui de CACHE_DIR)
+    Renvoie un dict : pareto, lorenz, (solutions si options["solutions"]), temps (du calcul), cache (relu ou non)
+    '''
+    cache = cache or ResultCache()
+    meta = cache.meta(instance, "indirecte", **options)
+    tableaux = None if bypass else cache.get(meta)
+    if tableaux is None:
+        start = time.perf_counter()
+        res = methode_indirecte(instance, verbose, **options)
+        temps = time.perf_counter() - start
+        p = instance.p
+        tableaux = {"pareto": np.array(res[0], dtype=np.int64).reshape(-1, p),
+                    "lorenz": np.array(res[1], dtype=np.int64).reshape(-1, p), "temps": np.array(temps)}
+        if options.get("solutions"):
+            tableaux["solutions"] = selection_matrix(res[2], instance.n)
+        cache.put(meta, **tableaux)
+        relu = False
+    else:
+        relu = True
+
+    out = {"pareto": _points(tableaux["pareto"]), "lorenz": _points(tableaux["lorenz"]),
+           "temps": float(tableaux["temps"]), "cache": relu}
+    if "solutions" in tableaux:
+        out["solutions"] = [np.flatnonzero(s).tolist() for s in tableaux["solutions"]]
+    return out
+
+def resultat_directe(instance, omega, bypass=False, cache=None, verbose=False, **options):
+    '''
+    enumerate_lorenz(instance, omega, verbose, **options) avec cache (clé sans omega)
+    bypass, cache: cf. resultat_indirecte
+    Renvoie un dict : objective_points, lorenz_vectors, temps, timings (par résolution, cf. enumerate_lorenz), cache
+    Si le résultat relu a été calculé avec un autre omega, les points sont les mêmes mais temps est None
+    et timings est vide (les temps dépendent de omega)
+    '''
+    if "timings" in options:
+        raise ValueError("timings ne peut pas être donné en option : les temps par résolution sont dans le résultat (\"timings\")")
+    cache = cache or ResultCache()
+    meta = cache.meta(instance, "directe", **options)
+    tableaux = None if bypass else cache.get(meta)
+    if tableaux is None:
+        timings = []
+        start = time.perf_counter()
+        y, L = enumerate_lorenz(instance, omega, verbose, timings=timings, **options)
+        temps = time.perf_counter() - start
+        p = instance.p
+        tableaux = {"objective_points": np.array(y, dtype=np.int64).reshape(-1, p),
+                    "lorenz_vectors": np.array(L, dtype=np.int64).reshape(-1, p), "temps": np.array(temps),
+                    "t_modele": np.array([t["modele"] for t in timings]),
+                    "t_resolution": np.array([t["resolution"] for t in timings]),
+                    "omega": np.asarray(omega, dtype=float)}
+        cache.put(meta, **tableaux)
+        relu = False
+    else:
+        relu = True
+
+    res = {"objective_points": _points(tableaux["objective_points"]), "lorenz_vectors": _points(tableaux["lorenz_vectors"]),
+           "temps": None, "timings": [], "cache": relu}
+    if "omega" in tableaux and np.array_equal(tableaux["omega"], np.asarray(omega, dtype=float)):
+        res["temps"] = float(tableaux["temps"])
+        res["timings"] = [{"iteration": k, "modele": m, "resolution": r}
+                          for k, (m, r) in enumerate(zip(tableaux["t_modele"].tolist(), tableaux["t_resolution"].tolist()))]
+    return res
@@ -0,0 +1,67 @@
+'''
+Points de reprise des calculs longs (direct.enumerate_lorenz, indirecte.pareto_dp)
+
+Un point de reprise est écrit de façon atomique (fichier temporaire puis os.replace) : un arrêt
+pendant l'écriture laisse l'ancien point de reprise intact. Il contient une empreinte de l'instance
+et les options du calcul, vérifiées à la reprise.
+- méthode directe : JSON (vecteurs objectifs et de Lorenz trouvés, qui suffisent à reconstruire les contraintes)
+- méthode indirecte : .npz (indice du prochain objet et table dp courante)
+'''
+
+import os
+import json
+
+import numpy as np
+
+def _remplace(path, ecrit):
+    '''
+    Ecrit le fichier path avec ecrit(f) dans un fichier temporaire, puis le met à sa place
+    '''
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        ecrit(f)
+    os.replace(tmp, path)
+
+def ecrit_json(path, meta, **donnees):
+    _remplace(path, lambda f: f.write(json.dumps({"meta": meta, **donnees}).encode()))
+
+def lit_json(path, meta):
+    '''
+    Renvoie les données du point de reprise (None s'il n'existe pas)
+    ValueError s'il a été écrit pour une autre instance ou d'autres options
+    '''
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        donnees = json.load(f)
+    _verifie(path, donnees.pop("meta"), meta)
+    return donnees
+
+def ecrit_npz(path, meta, **tableaux):
+    _remplace(path, lambda f: np.savez(f, meta=np.array(json.dumps(meta)), **tableaux))
+
+def lit_npz(path, meta):
+    '''
+    Renvoie {nom: tableau} du point de reprise (None s'il n'existe pas), cf. lit_json
+    '''
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as f:
+        tableaux = {k: f[k] for k in f.files}
+    _verifie(path, json.loads(str(tableaux.pop("meta"))), meta)
+    return tableaux
+
+def supprime(path):
+    '''
+    Supprime le point de reprise (calcul terminé)
+    '''
+    if os.path.exists(path):
+        os.remove(path)
+
+def _verifie(path, lu, attendu):
+    # Passage par JSON : tuples et listes sont comparés de la même façon
+    attendu = json.loads(json.dumps(attendu))
+    if lu != attendu:
+        differences = [k for k in attendu.keys() | lu.keys() if lu.get(k) != attendu.get(k)]
+        raise ValueError(f"Le point de reprise {path} ne correspond pas à ce calcul ({', '.join(sorted(differences))})")
@@ -13,7 +13,9 @@ import matplotlib.pyplot as plt
 from instance import read_instance
 from indirecte import methode_indirecte
 from direct import enumerate_lorenz
-from omega_test import omega_exp
+from omega_test import omega_exp, choix_lambda
+from runner import run_grid, tache
+from cache import resultat_indirecte, resultat_directe
 
 class Resultats:
     def __init__(self):
@@ -24,8 +26,11 @@ class Resultats:
         self.pareto_count = []
         self.lorenz_ind_count = []
         self.lorenz_dir_count = []
+        # Méthode indirecte incrémentale (benchmark(..., incremental=True)) : temps de l'étape et temps cumulé
+        self.t_ind_etape = []
+        self.t_ind_cumule = []
 
-    def add(self, n, p, t_ind, t_dir, pareto_count, lorenz_ind_count, lorenz_dir_count):
+    def add(self, n, p, t_ind, t_dir, pareto_count, lorenz_ind_count, lorenz_dir_count, t_ind_etape=None, t_ind_cumule=None):
         self.n.append(n)
         self.p.append(p)
         self.t_ind.append(round(t_ind,2))
@@ -33,17 +38,50 @@ class Resultats:
         self.pareto_count.append(pareto_count)
         self.lorenz_ind_count.append(lorenz_ind_count)
         self.lorenz_dir_count.append(lorenz_dir_count)
+        self.t_ind_etape.append(None if t_ind_etape is None else round(t_ind_etape,2))
+        self.t_ind_cumule.append(None if t_ind_cumule is None else round(t_ind_cumule,2))
 
     def to_csv(self, path):
+        # Colonnes de la méthode incrémentale seulement si elle a été utilisée
+        incremental = any(t is not None for t in self.t_ind_etape)
         with open(path, "w", newline="") as f:
             writer = csv.writer(f)
-            writer.writerow(["p", "n","t_ind", "t_dir","pareto_count", "lorenz_ind_count", "lorenz_dir_count"])
+            writer.writerow(["p", "n","t_ind", "t_dir","pareto_count", "lorenz_ind_count", "lorenz_dir_count"]
+                            + (["t_ind_etape", "t_ind_cumule"] if incremental else []))
             for i in range(len(self.n)):
-                writer.writerow([self.p[i], self.n[i],self.t_ind[i], self.t_dir[i],self.pareto_count[i], self.lorenz_ind_count[i], self.lorenz_dir_count[i]])
+                writer.writerow([self.p[i], self.n[i],self.t_ind[i], self.t_dir[i],self.pareto_count[i], self.lorenz_ind_count[i], self.lorenz_dir_count[i]]
+                                + ([self.t_ind_etape[i], self.t_ind_cumule[i]] if incremental else []))
 
         print(f"CSV ecrit: {path} ({len(self.n)} lignes)")
 
 
+def run_indirecte(instance, verbose=False, cache=False, **options):
+    '''
+    Méthode indirecte sur une instance (options : cf. methode_indirecte)
+    cache: si True, le résultat (toujours recalculé) est aussi enregistré dans le cache pour les autres scripts (cf. cache.py)
+    return: temps, points Pareto, points Lorenz
+    '''
+    if cache:
+        res = resultat_indirecte(instance, bypass=True, verbose=verbose, **options)
+        return res["temps"], res["pareto"], res["lorenz"]
+    start = time.perf_counter()
+    par, lor = methode_indirecte(instance, verbose, **options)[:2]
+    return time.perf_counter() - start, par, lor
+
+def run_directe(instance, omega, verbose=False, cache=False, **options):
+    '''
+    Méthode directe sur une instance (options : cf. enumerate_lorenz)
+    cache: cf. run_indirecte
+    return: temps, points Lorenz, nombre de résolutions du PLNE
+    '''
+    if cache:
+        res = resultat_directe(instance, omega, bypass=True, verbose=verbose, **options)
+        return res["temps"], res["objective_points"], len(res["timings"])
+    timings = []
+    start = time.perf_counter()
+    dir, _ = enumerate_lorenz(instance, omega, verbose, timings=timings, **options)
+    return time.perf_counter() - start, dir, len(timings)
+
 def run(n,p,omega, verbose=False, file="Data/2KP200-TA-0.dat"):
     '''
     Exécute les 2 méthodes sur 1 instance
@@ -56,42 +94,85 @@ def run(n,p,omega, verbose=False, file="Data/2KP200-TA-0.dat"):
     instance = read_instance(file, n, p)
 
     #Indirecte
-    start = time.perf_counter()
-    par, lor = methode_indirecte(instance, verbose)
-    temps_indirecte = time.perf_counter() - start
+    temps_indirecte, par, lor = run_indirecte(instance, verbose, cache=True)
 
     #Directe
-    start = time.perf_counter()
-    dir,_ = enumerate_lorenz(instance, omega, verbose)
-    temps_directe = time.perf_counter() - start
+    temps_directe, dir, _ = run_directe(instance, omega, verbose, cache=True)
     
     return temps_indirecte, temps_directe, len(par), len(lor), len(dir)
 
-def benchmark(N, P, lamb, file="Data/2KP200-TA-0.dat", verbose=False):
+def _temps(ligne):
+    '''
+    Temps d'une ligne du runner (nan si la tâche n'a pas abouti)
+    '''
+    return ligne["temps"] if ligne["statut"] == "ok" else float("nan")
+
+def benchmark(N, P, lamb, file="Data/2KP200-TA-0.dat", verbose=False, workers=None, timeout=None, runs_csv=None,
+              incremental=False):
+    '''
+    Exécute les 2 méthodes sur toute la grille (p, n), chaque méthode dans son propre processus (cf. runner.py)
+    workers: nb de processus en même temps (par défaut le nb de coeurs)
+    timeout: budget en secondes par méthode et par instance, au-delà le temps est nan et les nombres de points vides
+    runs_csv: CSV (format long) auquel chaque résultat est ajouté dès qu'il est obtenu
+    lamb: lambda de omega_exp pour la méthode directe, ou "auto" : choisi pour chaque instance par des exécutions
+          pilotes (cf. omega_test.choix_lambda, faites ici avant la grille)
+    incremental: si True, la méthode indirecte est exécutée une seule fois par p (tâche "indirecte_incrementale"
+                 du runner, timeout pour toutes les tailles), en étendant la table de n en n.
+                 Ses temps ne sont pas ceux d'une résolution de l'instance n : t_ind est nan, et ils sont dans
+                 t_ind_etape (passage de la taille précédente à n) et t_ind_cumule (depuis le début)
+    '''
 
     res = Resultats()
 
+    taches = []
+    predits = {} # temps prédits de la méthode directe (lamb="auto")
     for p in P:
         for n in N[p]:
-            omega = omega_exp(p, lamb)
-            temps_indirecte, temps_directe, par, lor, dir = run(n,p,omega)
-            res.add(n, p, temps_indirecte, temps_directe, par, lor, dir)
-
-            if verbose:
-                print("--"*20)
-                print(f"{p=}, {n=} : ")
-                print(f"Methode indirecte : \n{par} de Pareto et {lor} de Lorenz en {temps_directe:.2f}s")
-                print(f"Methode directe : \n{dir} de Lorenz en {temps_indirecte:.2f}s")
-                
-                if lor == dir:
-                    print(f"Bilan : {lor} points de Lorenz non dominés pour les 2 méthodes")
-                elif lor > dir:
-                    print(f"Bilan : {lor-dir} points de plus trouvés avec la méthode indirecte")
-                elif lor < dir:
-                    print(f"Bilan : {dir-lor} points de plus trouvés avec la méthode directe") #normalement impossible
-                print("--"*20)
+            if lamb == "auto":
+                choix = choix_lambda(read_instance(file, n, p))
+                l, omega = choix["lambda"], choix["omega"]
+                predits[p, n] = choix["temps_predit"]
             else:
-                print(f"{p = }, {n = } ...")
+                l, omega = lamb, omega_exp(p, lamb)
+            if not incremental:
+                taches.append(tache(p, n, "indirecte", l))
+            taches.append(tache(p, n, "directe", l, omega))
+    if incremental:
+        taches += [tache(p, None, "indirecte_incrementale", tailles=N[p]) for p in P]
+
+    lignes = run_grid(taches, file, workers=workers, timeout=timeout, csv_path=runs_csv)
+    if incremental:
+        directes = lignes[:-len(P)]
+        indirectes = [etape for ligne in lignes[-len(P):] for etape in ligne["etapes"]]
+    else:
+        indirectes, directes = lignes[::2], lignes[1::2]
+
+    for ind, dir in zip(indirectes, directes):
+        p, n = ind["p"], ind["n"]
+        par, lor, dir_count = ind["pareto_count"], ind["lorenz_count"], dir["lorenz_count"]
+        if incremental:
+            cumule = ind["temps_cumule"] if ind["statut"] == "ok" else float("nan")
+            res.add(n, p, float("nan"), _temps(dir), par, lor, dir_count, _temps(ind), cumule)
+        else:
+            res.add(n, p, _temps(ind), _temps(dir), par, lor, dir_count)
+
+        if verbose:
+            print("--"*20)
+            print(f"{p=}, {n=} : ")
+            print(f"Methode indirecte ({ind['statut']}) : \n{par} de Pareto et {lor} de Lorenz en {_temps(ind):.2f}s")
+            print(f"Methode directe ({dir['statut']}) : \n{dir_count} de Lorenz en {_temps(dir):.2f}s")
+            if predits.get((p, n)) is not None:
+                print(f"(lambda = {dir['lambda']}, temps prédit {predits[p, n]:.2f}s)")
+
+            if lor is None or dir_count is None:
+                print("Bilan : une des méthodes n'a pas abouti")
+            elif lor == dir_count:
+                print(f"Bilan : {lor} points de Lorenz non dominés pour les 2 méthodes")
+            elif lor > dir_count:
+                print(f"Bilan : {lor-dir_count} points de plus trouvés avec la méthode indirecte")
+            elif lor < dir_count:
+                print(f"Bilan : {dir_count-lor} points de plus trouvés avec la méthode directe") #normalement impossible
+            print("--"*20)
 
     print("Fin du benchmark")
 
@@ -102,7 +183,7 @@ if __name__ == "__main__":
 
     #Param
     file = "Data/2KP200-TA-0.dat"
-    lamb = 0.5
+    lamb = "auto" # choisi par instance (omega_test.choix_lambda)
 
     P = [2,3,4,5,6]
     N = {
@@ -113,6 +194,7 @@ if __name__ == "__main__":
         6 : [10, 15, 20, 25, 30]
     }
 
-    res = benchmark(N, P, lamb, file)
+    # 10 min max par méthode et par instance
+    res = benchmark(N, P, lamb, file, timeout=600, runs_csv="Resultats/comparaison_runs.csv")
 
     res.to_csv("Resultats/comparaison.csv")
\ No newline at end of file
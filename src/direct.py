@@ -6,143 +6,327 @@ Methode directe:
 
 '''
 
-import gurobipy as gp
-from gurobipy import GRB
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from instance import read_instance, lorenz_vector
+from instance import read_instance, lorenz_vector, selection_matrix
+from backends import choix_backend, OPTIMAL, INFEASIBLE, LIMITE
+from archive import ParetoArchive
+from skyline import lorenz_skyline
+from checkpoint import ecrit_json, lit_json, supprime
 
 # OWA qui retourne un vecteur de Lorenz non dominé
 # Pas utilisé -> equivalent à la 1ere itération de enumerate_lorenz (quand lorenz_vectors est vide)
-def solve_owa(instance, omega):
+def solve_owa(instance, omega, backend=None):
     '''
     Resoud le PL OWA et retourne un point objectif Lorenz non dominé et son vecteur de Lorenz
     '''
-
-    n = instance.n
-    p = instance.p
-    W = instance.capacity
-    weights = instance.weights
-    values = instance.values
-
-    #Calcul des poids lambda
-    lambdas = [omega[i] - omega[i+1] for i in range(p-1)] + [omega[p-1]]
-
-    #Declaration du pb
-    model = gp.Model("OWA_Lorenz")
-    model.Params.OutputFlag = 0 
-
-    # Variables
-    x = model.addVars(n, vtype=GRB.BINARY, name="x")
-    r = model.addVars(p, lb=-GRB.INFINITY, name="r")
-    b = model.addVars(p, p, lb=0, name="b")
-
-    # Fonction objectif OWA
-    model.setObjective(gp.quicksum(lambdas[k] * ((k+1)*r[k] - gp.quicksum(b[k,i] for i in range(p))) for k in range(p)),GRB.MAXIMIZE) # k+1 car k de 1 à p mais de 0 à p-1 en python
-
-    # Contraintes de linéarisation
-    for k in range(p):
-        for i in range(p):
-            model.addConstr(r[k] - b[k,i] <= gp.quicksum(values[j][i] * x[j] for j in range(n)))
-
-    # Contrainte de capacité
-    model.addConstr(gp.quicksum(weights[j] * x[j] for j in range(n)) <= W)
+    modele = choix_backend(backend)(instance, omega)
 
     # Résolution
-    model.optimize()
-
-    if model.status != GRB.OPTIMAL:
+    if modele.solve() != OPTIMAL:
         print("Pas de solution trouvée")
         return None, None
 
     # Récupération de la solution
-    selected_items = [j for j in range(n) if x[j].X > 0.5]
+    selected_items = modele.selection()
     y = instance.eval(selected_items)
     L = lorenz_vector(y)
 
     return y, L
 
-def enumerate_lorenz(instance, omega, verbose=True):
+def enumerate_lorenz(instance, omega, verbose=True, persistent=True, backend=None, backend_options=None, timings=None, pool=0, total_range=None, known_lorenz=(),
+                     checkpoint=None, checkpoint_interval=0):
     '''
     Génère tous les vecteurs Lorenz non dominés
+    persistent: si True, le PL est construit une seule fois et on ajoute seulement la nouvelle
+                contrainte d'amélioration à chaque itération (le solveur garde ses informations et
+                reçoit une solution de départ). Sinon on reconstruit le PL à chaque itération.
+                Avec pulp, seul le PL Python est gardé : PuLP redonne le modèle complet au solveur à chaque résolution
+    backend: solveur PLNE ("gurobi", "scipy", "pulp", cf. backends.py), par défaut le premier installé
+    backend_options: paramètres supplémentaires du backend (ex: {"solver": ...} pour pulp)
+    timings: liste optionnelle, reçoit pour chaque itération le temps de construction du PL
+             et le temps de résolution
+    pool: si > 0, on récupère jusqu'à pool solutions par résolution (pool de solutions de Gurobi)
+          et on ajoute d'un coup les contraintes d'amélioration de celles qui sont Lorenz non dominées.
+          Les points trouvés ainsi et dominés plus tard sont retirés du résultat
+    total_range: (lo, hi), ne cherche que les points dont la somme des objectifs est dans [lo, hi]
+                 (les points renvoyés sont alors non dominés dans cette région seulement)
+    known_lorenz: vecteurs de Lorenz déjà connus (trouvés ailleurs) : leurs contraintes d'amélioration
+                  sont ajoutées dès le départ, ils ne sont pas renvoyés
+    checkpoint: fichier JSON de reprise. S'il existe, on repart des points qu'il contient (leurs contraintes
+                d'amélioration sont reconstruites), sinon il est créé. Il est mis à jour au plus toutes les
+                checkpoint_interval secondes quand de nouveaux points sont trouvés, et supprimé à la fin.
+                On obtient les mêmes vecteurs de Lorenz qu'en une seule exécution (si plusieurs solutions ont
+                le même vecteur de Lorenz, le vecteur objectif renvoyé peut changer avec le chemin du solveur)
     '''
-    n = instance.n #nb d'objets
-    p = instance.p #nb d'objectifs
-    W = instance.capacity
-    weights = instance.weights
-    values = instance.values
-
-    #Calcul des poids lambda
-    lambdas = [omega[i] - omega[i+1] for i in range(p-1)] + [omega[p-1]]
+    Backend = choix_backend(backend)
+    backend_options = backend_options or {}
 
     lorenz_vectors = []  #Vecteurs de Lorenz
     objective_points = [] #Vecteurs objectifs associé
+    front = ParetoArchive() # vecteurs de Lorenz non dominés parmi ceux trouvés (utile avec pool)
+
+    if checkpoint is not None:
+        meta = {"instance": instance.digest(), "total_range": total_range}
+        reprise = lit_json(checkpoint, meta)
+        if reprise is not None:
+            objective_points = [tuple(y) for y in reprise["objective_points"]]
+            lorenz_vectors = [tuple(L) for L in reprise["lorenz_vectors"]]
+            for L in lorenz_vectors:
+                front.update(L)
+            if verbose:
+                print(f"Reprise de {checkpoint} : {len(lorenz_vectors)} points déjà trouvés")
+        derniere_ecriture = time.perf_counter()
+
+    start = time.perf_counter()
+    if persistent:
+        modele = Backend(instance, omega, **backend_options)
+        modele.set_pool(pool)
+        if total_range is not None:
+            modele.restrict_total(*total_range)
+        for Ls in list(known_lorenz) + list(front):
+            modele.add_cut(Ls)
 
     while True:
-        #On créer un nouveau PL à chaque itération
-        model = gp.Model("OWA")
-        model.Params.OutputFlag = 0
-
-        # Variables
-        x = model.addVars(n, vtype=GRB.BINARY, name="x")
-        r = model.addVars(p, lb=-GRB.INFINITY, name="r")
-        b = model.addVars(p, p, lb=0, name="b")
-
-        # Fonction objectif
-        model.setObjective(gp.quicksum(lambdas[k] * ((k+1)*r[k] - gp.quicksum(b[k,i] for i in range(p))) for k in range(p)), GRB.MAXIMIZE)
-
-        #Contraintes
-        for k in range(p):
-            for i in range(p):
-                # rk - bik <= sum vij*xj pour i,k de 1 à p
-                model.addConstr( r[k] - b[k,i] <= gp.quicksum(values[j][i] * x[j] for j in range(n)))
-
-        # sum wi*xi <= W -> contrainte de capacité
-        model.addConstr(gp.quicksum(weights[j] * x[j] for j in range(n)) <= W)
-
-        # Contraintes d'amélioration
-        for s, Ls in enumerate(lorenz_vectors):
-            z = model.addVars(p, vtype=GRB.BINARY, name=f"z_{s}")
-
-            for k in range(p):
-                # k*r[k] - sum b >= (Ls[k] + 1)*z[k]
-                model.addConstr((k+1)*r[k] - gp.quicksum(b[k,i] for i in range(p)) >= (Ls[k] + 1)*z[k])
-
-            model.addConstr(gp.quicksum(z[k] for k in range(p)) >= 1)
-
-        #Contraine d'amelioration avec tout les points Lorenz non dominés
-        # for s, Ls in enumerate(lorenz_vectors):
-        #     z = model.addVars(p, vtype=GRB.BINARY, name=f"z_{s}")
-
-        #     for k in range(p):
-        #         # k*r[k] - sum b >= (Ls[k] + 1)*z[k]
-        #         model.addConstr((k+1)*r[k] - gp.quicksum(b[k,i] for i in range(p)) >= Ls[k])
-            
-        #     model.addConstr(gp.quicksum(z[k] for k in range(p)) >= 1)
-            
-        # for i, ys in enumerate(objective_points):
-        #     # fi(x) >= (ys[i] + 1)*z[i]
-        #     for i in range(p):
-        #         model.addConstr( (ys[i]+1)*z[i] <= gp.quicksum(values[j][i] * x[j] for j in range(n)))
-
-        model.optimize()
-
-        if model.status != GRB.OPTIMAL:
+        if not persistent:
+            #On créer un nouveau PL à chaque itération
+            modele = Backend(instance, omega, **backend_options)
+            modele.set_pool(pool)
+            if total_range is not None:
+                modele.restrict_total(*total_range)
+
+            # Contraintes d'amélioration
+            for Ls in list(known_lorenz) + lorenz_vectors:
+                modele.add_cut(Ls)
+
+        t_modele = time.perf_counter() - start
+
+        start = time.perf_counter()
+        status = modele.solve()
+        t_resolution = time.perf_counter() - start
+
+        if timings is not None:
+            timings.append({"iteration": len(timings), "modele": t_modele, "resolution": t_resolution})
+
+        if status != OPTIMAL:
             if verbose:
                 print("Plus aucune solution !")
             break #plus de vecteurs Lorenz non dominé
 
-        # Récupération des objets sélectionnés
-        selected = [j for j in range(n) if x[j].X > 0.5]
+        # Récupération des objets sélectionnés (la solution optimale, plus celles du pool)
+        nouveaux = []
+        selections = modele.selections() if pool > 0 else [modele.selection()]
+        _, Y, LY = instance.eval_batch(selection_matrix(selections, instance.n)) # évaluation d'un coup
+        for y, L in zip(map(tuple, Y.tolist()), map(tuple, LY.tolist())):
+
+            # L est gardé s'il n'est pas dominé par un vecteur déjà trouvé
+            # (la solution optimale ne l'est jamais, celles du pool peuvent l'être)
+            if front.update(L):
+                if verbose:
+                    print(f"Solution trouvée : {y} -> {L} (PL {t_modele:.3f}s, résolution {t_resolution:.3f}s)")
+                objective_points.append(y)
+                lorenz_vectors.append(L)
+                nouveaux.append(L)
+
+        if checkpoint is not None and nouveaux and time.perf_counter() - derniere_ecriture >= checkpoint_interval:
+            ecrit_json(checkpoint, meta, objective_points=objective_points, lorenz_vectors=lorenz_vectors)
+            derniere_ecriture = time.perf_counter()
+
+        start = time.perf_counter()
+        if persistent:
+            # Une contrainte pour un vecteur dominé par un autre vecteur du lot serait redondante
+            actifs = set(front)
+            for L in nouveaux:
+                if L in actifs:
+                    modele.add_cut(L)
+
+    # On retire les points du pool dominés par des points trouvés ensuite
+    garde = set(front)
+    objective_points = [y for y, L in zip(objective_points, lorenz_vectors) if L in garde]
+    lorenz_vectors = [L for L in lorenz_vectors if L in garde]
+
+    if checkpoint is not None:
+        supprime(checkpoint)
+    return objective_points, lorenz_vectors
+
+COMPLET = "complete"
+TRONQUE = "truncated"
 
-        # Évaluation
-        y = instance.eval(selected)
-        L = lorenz_vector(y)
+class EnumerationAnytime:
+    '''
+    Méthode directe "anytime" : chaque point Lorenz non dominé est renvoyé dès qu'il est trouvé
+
+        enum = EnumerationAnytime(instance, omega, time_budget=60, solve_time_limit=10)
+        for point in enum:
+            print(point["y"], point["L"])
+        print(enum.status, enum.raison, enum.borne)
+
+    time_budget: temps total (s) pour l'énumération (construction du PL comprise)
+    solve_time_limit: temps max (s) d'une résolution du PLNE
+    max_points: nb max de points renvoyés
+    backend, backend_options: cf. enumerate_lorenz (PL persistant, sans pool)
+
+    Chaque point est un dict : y, L, selection, iteration, modele (s), resolution (s), valeur (OWA), temps (s depuis le début)
+    Après l'itération :
+    - status : COMPLET (le PLNE est devenu irréalisable : tous les points ont été trouvés) ou TRONQUE
+    - raison : pourquoi on s'est arrêté ("infeasible", "time_budget", "solve_time_limit", "max_points",
+               "interrupted" si on sort de la boucle avant la fin, ou le statut du solveur)
+    - borne : si TRONQUE, majorant de la valeur OWA des points qui manquent (borne du PLNE de la dernière
+              résolution, les contraintes d'amélioration ne font que réduire l'ensemble réalisable), None si inconnu
+    - objective_points, lorenz_vectors : points trouvés jusque-là
+    Chaque itération repart de zéro (nouveau PL, points et statut remis à zéro)
+    '''
+    def __init__(self, instance, omega, time_budget=None, solve_time_limit=None, max_points=None, backend=None, backend_options=None):
+        self.instance = instance
+        self.omega = omega
+        self.time_budget = time_budget
+        self.solve_time_limit = solve_time_limit
+        self.max_points = max_points
+        self.Backend = choix_backend(backend)
+        self.backend_options = backend_options or {}
+        self._reinitialise()
+
+    def _reinitialise(self):
+        self.status = TRONQUE
+        self.raison = "interrupted" # tant que l'itération n'est pas allée jusqu'au bout
+        self.borne = None
+        self.objective_points = []
+        self.lorenz_vectors = []
+
+    def _limite(self, debut):
+        '''
+        Limite de temps de la prochaine résolution (None : pas de limite) et raison associée
+        '''
+        limite, raison = self.solve_time_limit, "solve_time_limit"
+        if self.time_budget is not None:
+            reste = self.time_budget - (time.perf_counter() - debut)
+            if limite is None or reste < limite:
+                limite, raison = reste, "time_budget"
+        return limite, raison
+
+    def __iter__(self):
+        self._reinitialise()
+        instance = self.instance
+        debut = time.perf_counter()
+        start = debut
+        modele = self.Backend(instance, self.omega, **self.backend_options)
+
+        while True:
+            if self.max_points is not None and len(self.lorenz_vectors) >= self.max_points:
+                self.raison = "max_points"
+                return
+            limite, raison = self._limite(debut)
+            if limite is not None and limite <= 0:
+                self.raison = "time_budget"
+                return
+            modele.set_time_limit(limite)
+            t_modele = time.perf_counter() - start
+
+            start = time.perf_counter()
+            status = modele.solve()
+            t_resolution = time.perf_counter() - start
+            self.borne = modele.borne()
+
+            if status == INFEASIBLE:
+                self.status, self.raison, self.borne = COMPLET, status, None
+                return
+            if status != OPTIMAL:
+                # Une solution non prouvée optimale peut être Lorenz dominée : on ne la renvoie pas
+                self.raison = raison if status == LIMITE else status
+                return
+
+            selection = modele.selection()
+            y = instance.eval(selection)
+            L = lorenz_vector(y)
+            self.objective_points.append(y)
+            self.lorenz_vectors.append(L)
+
+            start = time.perf_counter()
+            yield {"y": y, "L": L, "selection": selection, "iteration": len(self.lorenz_vectors) - 1,
+                   "modele": t_modele, "resolution": t_resolution, "valeur": self.borne,
+                   "temps": start - debut}
+
+            start = time.perf_counter() # le temps passé par l'appelant n'est pas compté dans le PL
+            modele.add_cut(L)
+
+def _borne_total(instance):
+    '''
+    Majorant de la somme des objectifs (sac à dos fractionnaire sur la somme des valeurs)
+    '''
+    weights = instance.weights_list
+    totaux = instance.values.sum(axis=1).tolist()
+    objets = sorted(range(instance.n), key=lambda j: -totaux[j] / weights[j])
+    capa = instance.capacity
+    borne = 0
+    for j in objets:
+        w, v = weights[j], totaux[j]
+        if w <= capa:
+            capa -= w
+            borne += v
+        else:
+            borne += v * capa // w
+            break
+    return borne
+
+def _enumere_region(instance, omega, backend, backend_options, lo, hi, connus):
+    '''
+    Travail d'un processus : énumération restreinte à la région lo <= somme des objectifs <= hi
+    '''
+    y, L = enumerate_lorenz(instance, omega, verbose=False, backend=backend,
+                            backend_options=backend_options, total_range=(lo, hi), known_lorenz=connus)
+    return lo, y, L
+
+def enumerate_lorenz_parallel(instance, omega, workers=None, regions=None, verbose=True, backend=None, backend_options=None):
+    '''
+    Méthode directe en parallèle : l'espace est découpé en régions disjointes selon la somme des objectifs
+    (dernière composante du vecteur de Lorenz), chaque région est énumérée dans un processus,
+    puis on fusionne et on retire les points dominés par ceux d'autres régions
+    workers: nb de processus (par défaut le nb de coeurs)
+    regions: nb de régions (par défaut 4 par processus, pour équilibrer la charge)
+    '''
+    Backend = choix_backend(backend)
+    backend_options = dict(backend_options or {})
+    if Backend.nom == "gurobi":
+        backend_options.setdefault("threads", 1) # un coeur par processus
+
+    workers = workers or os.cpu_count()
+    regions = regions or 4 * workers
+
+    # Un premier point Lorenz non dominé y0 : tout point de somme < p*min(y0) est dominé par y0
+    y0, L0 = solve_owa(instance, omega, backend=Backend)
+    if y0 is None:
+        return [], []
+    lo = instance.p * min(y0)
+    hi = _borne_total(instance)
+
+    # Régions de même largeur entre lo et hi
+    bornes = [lo + (hi - lo + 1) * k // regions for k in range(regions + 1)]
+
+    # spawn : les solveurs (Gurobi en particulier) ne supportent pas d'être copiés par fork
+    resultats = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # y0 est connu de toutes les régions (il élimine tous les points qu'il domine),
+        # les régions de plus grande somme, souvent les plus longues, partent en premier
+        taches = [pool.submit(_enumere_region, instance, omega, Backend, backend_options, a, b - 1, [L0])
+                  for a, b in reversed(list(zip(bornes[:-1], bornes[1:]))) if a < b]
+
+        for tache in as_completed(taches):
+            a, y, L = tache.result()
+            if verbose:
+                print(f"Région somme >= {a} : {len(y)} points")
+            resultats.append((a, y, L))
 
-        if verbose:
-            print(f"Solution trouvée : {y} -> {L}")
+    resultats.sort(key=lambda res: res[0])
+    objective_points = [y0] + [y for _, ys, _ in resultats for y in ys]
+    lorenz_vectors = [L0] + [L for _, _, Ls in resultats for L in Ls]
 
-        objective_points.append(y)
-        lorenz_vectors.append(L)
+    # Un point non dominé dans sa région peut être dominé par un point d'une autre région
+    garde = lorenz_skyline(objective_points)
+    objective_points = [y for y, g in zip(objective_points, garde) if g]
+    lorenz_vectors = [L for L, g in zip(lorenz_vectors, garde) if g]
 
     return objective_points, lorenz_vectors
 
@@ -0,0 +1,176 @@
+'''
+Programmation dynamique de la méthode indirecte hors mémoire (filtre "bucket")
+
+La table dp d'une itération reste au format CSR de indirecte.py :
+- l'index (poids, debut) est petit et reste en mémoire
+- les vecteurs vals sont gardés en mémoire tant que la table tient dans le budget,
+  sinon ils sont écrits dans un fichier et relus par memory-map
+
+Avec le filtre par poids, dp[w] à l'itération i+1 ne dépend que de dp[w] et dp[w - wi] à l'itération i :
+la nouvelle table est construite par tranches de poids [a, b), chaque tranche ne lit que deux
+tranches contiguës de l'ancienne table. On choisit les tranches pour que le nombre d'états lus
+par tranche tienne dans le budget. Le résultat est le même que celui de indirecte.pareto_dp.
+'''
+
+import os
+import time
+import tempfile
+
+import numpy as np
+
+from indirecte import _filtre_groupes
+from skyline import skyline
+from biobjectif import filtre_groupes_bi, front_bi
+
+FACTEUR_FILTRE = 16 # mémoire utilisée par le filtre d'une tranche, en nb de copies de ses vecteurs
+
+def _nb_avant(poids, debut, x):
+    '''
+    Nombre d'états de poids < x (x scalaire ou tableau)
+    '''
+    return debut[np.searchsorted(poids, x, side="left")]
+
+def _tranches(poids, debut, wi, W, max_etats):
+    '''
+    Découpe les poids de la nouvelle table [0, W] en tranches [a, b)
+    telles que chaque tranche lise au plus max_etats états de l'ancienne table
+    (sauf si un seul poids en demande plus : il forme alors une tranche à lui seul)
+    '''
+    # Poids possibles dans la nouvelle table : bornes candidates des tranches
+    cand = np.unique(np.concatenate((poids, poids[poids + wi <= W] + wi)))
+    # Nb d'états lus pour les poids < b : anciens dp[w] et dp[w - wi], croissant avec b
+    cumul = _nb_avant(poids, debut, cand) + _nb_avant(poids, debut, cand - wi)
+
+    bornes = [0]
+    k = 0
+    while k < len(cand):
+        # Dernier candidat tel que la tranche [cand[k], cand[j]) reste dans le budget
+        j = int(np.searchsorted(cumul, cumul[k] + max_etats, side="right")) - 1
+        j = max(j, k + 1)
+        if j >= len(cand):
+            break
+        bornes.append(int(cand[j]))
+        k = j
+    bornes.append(W + 1)
+    return bornes
+
+def _lignes(poids, debut, a, b):
+    '''
+    Etats de poids dans [a, b) : (premier, dernier + 1) dans vals, et leurs poids
+    '''
+    g0, g1 = np.searchsorted(poids, [a, b], side="left")
+    w = np.repeat(poids[g0:g1], np.diff(debut[g0:g1 + 1]))
+    return int(debut[g0]), int(debut[g1]), w
+
+class _Sortie:
+    '''
+    Nouvelle table en construction, tranche par tranche (en mémoire ou dans un fichier)
+    '''
+    def __init__(self, p, path=None):
+        self.p = p
+        self.path = path
+        self.blocs = []
+        self.f = open(path, "wb") if path is not None else None
+        self.poids = []
+        self.tailles = []
+
+    def ajoute(self, w, v):
+        if len(w) == 0:
+            return
+        poids, taille = np.unique(w, return_counts=True) # w est trié par poids croissant
+        self.poids.append(poids)
+        self.tailles.append(taille)
+        if self.f is not None:
+            np.ascontiguousarray(v, dtype=np.int64).tofile(self.f)
+        else:
+            self.blocs.append(v)
+
+    def table(self):
+        '''
+        Renvoie (poids, debut, vals), vals étant un memmap si la table est sur disque
+        '''
+        poids = np.concatenate(self.poids)
+        debut = np.concatenate(([0], np.cumsum(np.concatenate(self.tailles))))
+        if self.f is None:
+            return poids, debut, np.concatenate(self.blocs)
+        self.f.close()
+        vals = np.memmap(self.path, dtype=np.int64, mode="r", shape=(int(debut[-1]), self.p))
+        return poids, debut, vals
+
+def pareto_dp_hors_memoire(instance, memory_budget, verbose=False, dossier=None, offset=None, trace=None):
+    '''
+    Même résultat que indirecte.pareto_dp(instance) (filtre "bucket")
+    memory_budget: mémoire (en octets) pour les vecteurs d'une table et le filtre d'une tranche.
+                   Une table qui ne tient pas dans le budget est écrite sur disque
+    dossier: dossier des fichiers temporaires (par défaut celui du système)
+    offset, trace: cf. indirecte.pareto_dp (dans la trace, octets = plus grosse tranche en mémoire)
+    '''
+    W = instance.capacity
+    p = instance.p
+    octets_etat = 8 * p
+    max_etats = max(1, memory_budget // (FACTEUR_FILTRE * octets_etat))
+
+    poids = np.zeros(1, dtype=np.int64)
+    debut = np.array([0, 1], dtype=np.int64)
+    vals = np.zeros((1, p), dtype=np.int64)
+    if offset is not None:
+        vals[0] = offset
+
+    with tempfile.TemporaryDirectory(dir=dossier) as tmp:
+        fichiers = [os.path.join(tmp, "couche_0.bin"), os.path.join(tmp, "couche_1.bin")]
+
+        for i in range(instance.n):
+            wi = instance.weights[i]
+            vi = np.asarray(instance.values[i], dtype=np.int64)
+
+            # Taille max de la nouvelle table : sur disque si elle dépasse le budget
+            m_max = len(vals) + int(debut[-1] - _nb_avant(poids, debut, W - wi + 1))
+            disque = m_max * octets_etat > memory_budget
+            if verbose:
+                print(f"Objet {i} -> {len(vals)} points dans la table ({len(poids)} poids atteignables)"
+                      + (" [disque]" if disque else ""))
+            if trace is not None:
+                t_objet = time.perf_counter()
+                ligne = dict(objet=i, poids_objet=int(wi), candidats=0, elagues=0, inseres=0, supprimes=0,
+                             temps_filtre=0.0, octets=0)
+
+            sortie = _Sortie(p, fichiers[i % 2] if disque else None)
+            bornes = _tranches(poids, debut, wi, W, max_etats)
+            for a, b in zip(bornes[:-1], bornes[1:]):
+                # Anciens dp[w] et dp[w - wi] décalés, pour w dans [a, b)
+                r0, r1, w_anc = _lignes(poids, debut, a, b)
+                s0, s1, w_dec = _lignes(poids, debut, a - wi, b - wi)
+                w_new = np.concatenate((w_anc, w_dec + wi))
+                v_new = np.concatenate((np.asarray(vals[r0:r1]), np.asarray(vals[s0:s1]) + vi))
+
+                if trace is not None:
+                    t_filtre = time.perf_counter()
+                if p == 2:
+                    garde = filtre_groupes_bi(w_new, v_new, r1 - r0, trace)
+                else:
+                    garde = _filtre_groupes(w_new, v_new, trace)
+                if trace is not None:
+                    inseres = int((garde >= r1 - r0).sum())
+                    ligne["temps_filtre"] += time.perf_counter() - t_filtre
+                    ligne["candidats"] += len(w_new)
+                    ligne["inseres"] += inseres
+                    ligne["supprimes"] += (r1 - r0) - (len(garde) - inseres)
+                    ligne["octets"] = max(ligne["octets"], w_new.nbytes + v_new.nbytes)
+                sortie.ajoute(w_new[garde], v_new[garde])
+
+            del vals # libère le memmap de l'ancienne table avant de réutiliser son fichier
+            poids, debut, vals = sortie.table()
+            if trace is not None:
+                trace.objet(etats=len(vals), poids_atteignables=len(poids), temps=time.perf_counter() - t_objet, **ligne)
+
+        # Fusion finale par tranches : le front courant reste petit devant la table
+        t_fusion = time.perf_counter()
+        front = np.zeros((0, p), dtype=np.int64)
+        for r0 in range(0, len(vals), max_etats):
+            bloc = np.concatenate((front, np.asarray(vals[r0:r0 + max_etats])))
+            front = bloc[front_bi(bloc) if p == 2 else skyline(bloc)]
+        if trace is not None:
+            trace.fusion = {"temps": time.perf_counter() - t_fusion, "etats": len(vals), "front": len(front)}
+        del vals
+
+    return [tuple(v) for v in front.tolist()]
@@ -6,7 +6,14 @@ Procédure en 2 phases pour déterminer l'ensemble des points Lorenz non dominé
 (2) filtrer cet ensemble de points afin de ne garder que les points Lorenz non dominés
 '''
 
-from instance import pareto_dominate, lorenz_dominate, read_instance, plot_2d_points, lorenz_vector
+from instance import pareto_dominate, read_instance, plot_2d_points, lorenz_vectors
+from bornes import BornesCompletion, solutions_gloutonnes, lorenz_domine_strict, maj_front_lorenz
+from skyline import skyline, lorenz_skyline
+from biobjectif import filtre_groupes_bi, front_bi, lorenz_masque_bi
+from preprocessing import Pretraitement
+from checkpoint import ecrit_npz, lit_npz, supprime
+import time
+
 import numpy as np
 
 def pareto_insert(points, new):
@@ -33,61 +40,454 @@ def pareto_insert(points, new):
 
 # 1ère étape : Pareto non dominés 
 
-def pareto_dp(instance, verbose=False):
+# La table dp est stockée sous forme compacte (format CSR) :
+#   - poids : tableau (k,) des poids atteignables, triés par ordre croissant
+#   - debut : tableau (k+1,) des offsets, les vecteurs de poids poids[g] sont vals[debut[g]:debut[g+1]]
+#   - vals  : tableau (m, p) contigu de tous les vecteurs objectifs
+# Seuls les poids atteignables prennent de la place.
+
+TAILLE_BLOC = 1 << 21 # nombre max de paires comparées à la fois (borne la mémoire)
+
+def _filtre_groupes(groupes, vals, trace=None):
+    '''
+    groupes: identifiant de groupe (poids) de chaque vecteur
+    vals: vecteurs objectifs (m, p)
+    Renvoie les indices des vecteurs Pareto non dominés dans leur groupe (doublons supprimés),
+    triés par groupe croissant puis par somme décroissante
+    trace: si donnée, on y compte les comparaisons (cf. tracing.py)
+    '''
+    m = len(groupes)
+    if m == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Tri par groupe, puis somme décroissante : un dominant est toujours placé avant le dominé
+    cles = [vals[:, j] for j in range(vals.shape[1] - 1, -1, -1)] + [-vals.sum(axis=1), groupes]
+    ordre = np.lexsort(cles)
+    g = groupes[ordre]
+    v = vals[ordre]
+
+    # Suppression des doublons (même groupe et même vecteur -> adjacents après le tri)
+    doublon = np.zeros(m, dtype=bool)
+    doublon[1:] = (g[1:] == g[:-1]) & np.all(v[1:] == v[:-1], axis=1)
+    ordre, g, v = ordre[~doublon], g[~doublon], v[~doublon]
+    m = len(ordre)
+
+    # Position de chaque vecteur dans son groupe
+    nouveau = np.ones(m, dtype=bool)
+    nouveau[1:] = g[1:] != g[:-1]
+    debut_groupe = np.flatnonzero(nouveau)
+    taille = np.diff(np.append(debut_groupe, m))
+    pos = np.arange(m) - np.repeat(debut_groupe, taille)
+    if trace is not None:
+        trace.comparaisons += int(pos.sum())
+
+    # Chaque vecteur b est comparé aux vecteurs a placés avant lui dans son groupe
+    domine = np.zeros(m, dtype=bool)
+    cumul = np.cumsum(pos)
+    b0 = 0
+    while b0 < m:
+        # On prend un bloc de vecteurs [b0, b1) dont le nombre de paires reste raisonnable
+        b1 = int(np.searchsorted(cumul, cumul[b0] - pos[b0] + TAILLE_BLOC, side="right"))
+        b1 = max(b1, b0 + 1)
+        nb = pos[b0:b1]
+        if nb.sum() > 0:
+            b = np.repeat(np.arange(b0, b1), nb)
+            a = b - pos[b] + (np.arange(len(b)) - np.repeat(np.cumsum(nb) - nb, nb))
+            dom = np.ones(len(b), dtype=bool) # vecteurs distincts -> domination stricte
+            for j in range(v.shape[1]):
+                dom &= v[a, j] >= v[b, j]
+            domine[b[dom]] = True
+        b0 = b1
+
+    return ordre[~domine]
+
+TAILLE_FENETRE = 256 # nombre d'états traités à la fois par _filtre_poids
+AVANT = np.triu(np.ones((TAILLE_FENETRE, TAILLE_FENETRE), dtype=bool), 1) # AVANT[i, j] : i est placé avant j
+
+def _domine_faible(a, b):
+    '''
+    Matrice (len(a), len(b)) : a[i] >= b[j] composante par composante
+    '''
+    dom = np.ones((len(a), len(b)), dtype=bool)
+    for j in range(a.shape[1]):
+        dom &= a[:, j, None] >= b[None, :, j]
+    return dom
+
+def _filtre_poids(vals, garde, trace=None):
+    '''
+    Filtre où le poids est un critère supplémentaire à minimiser, appliqué après le filtre par poids :
+    un état est supprimé s'il existe un état plus léger avec des valeurs au moins aussi bonnes
+    garde: indices des états non dominés dans leur dp[w], triés par poids croissant (cf. _filtre_groupes)
+    Renvoie les indices de garde conservés, dans le même ordre
+    '''
+    v = vals[garde]
+    garde_poids = np.ones(len(v), dtype=bool)
+    # Front (en valeurs) des états déjà gardés, plus légers que ceux de la fenêtre : il est petit
+    # et mis à jour à chaque fenêtre (on ajoute le front de la fenêtre, on retire ce qu'il domine)
+    front = np.zeros((0, v.shape[1]), dtype=v.dtype)
+    for b0 in range(0, len(v), TAILLE_FENETRE):
+        bloc = v[b0:b0 + TAILLE_FENETRE]
+        k = len(bloc)
+        if trace is not None:
+            trace.comparaisons += len(front) * k + k * (k - 1)
+        interne = _domine_faible(bloc, bloc)
+        domine = (interne & AVANT[:k, :k]).any(axis=0) # un état placé avant est au plus aussi lourd
+        domine |= _domine_faible(front, bloc).any(axis=0)
+        garde_poids[b0:b0 + k] = ~domine
+
+        # Les états gardés ont des vecteurs distincts : le front de la fenêtre est ceux qu'aucun autre ne domine
+        np.fill_diagonal(interne, False)
+        nouveaux = bloc[~domine & ~interne[~domine].any(axis=0)]
+        front = np.concatenate((front[~_domine_faible(nouveaux, front).any(axis=0)], nouveaux))
+
+    return garde[garde_poids]
+
+def _decale(poids, debut, vals, wi, vi, W):
+    '''
+    Candidats après l'objet (wi, vi) : anciens états (en tête), puis les états où on peut le prendre (w + wi <= W)
+    Renvoie (poids, vals, masque des anciens états qui prennent l'objet, nb d'anciens états)
+    '''
+    w_etats = np.repeat(poids, np.diff(debut))
+    prend = w_etats + wi <= W
+    w_new = np.concatenate((w_etats, w_etats[prend] + wi))
+    v_new = np.concatenate((vals, vals[prend] + vi))
+    return w_new, v_new, prend, len(w_etats)
+
+def _filtre(w_new, v_new, n_anc, dominance, trace=None):
+    '''
+    Filtre de dominance exact des candidats de _decale (cf. pareto_dp), renvoie les indices gardés
+    '''
+    if v_new.shape[1] == 2:
+        # Fusion linéaire des anciens dp[w] et des dp[w] décalés (tous triés par v1 décroissant).
+        # "weight" n'est pas appliqué : il supprime peu d'états pour p = 2 et coûte plus que la fusion
+        return filtre_groupes_bi(w_new, v_new, n_anc, trace)
+    # Filtre Pareto dans chaque dp[w]
+    garde = _filtre_groupes(w_new, v_new, trace)
+    if dominance == "weight":
+        garde = _filtre_poids(v_new, garde, trace)
+    return garde
+
+def _table(w):
+    '''
+    Index (poids, debut) de la table à partir des poids des états gardés (triés par poids)
+    '''
+    poids, idx = np.unique(w, return_index=True)
+    return poids, np.append(idx, len(w))
+
+def _front(vals):
+    '''
+    Indices des points Pareto non dominés de toute la table
+    (vals contient tous les dp[w] : un seul filtre par tri sur l'ensemble)
+    '''
+    return front_bi(vals) if vals.shape[1] == 2 else skyline(vals)
+
+NB_ARRONDIS = 5 # mode approché : nb d'objets après lesquels on filtre sur la grille (répartis régulièrement)
+
+def _cellules(vals, log_delta):
+    '''
+    Mode approché : cellule de chaque état dans la grille géométrique de raison delta de l'espace des objectifs
+    (cellule de v_k : floor(log(v_k) / log(delta)), v_k = 0 formant sa propre cellule)
+    Si les cellules de a sont >= à celles de b, alors delta * a >= b : les filtres de dominance appliqués
+    aux cellules (au lieu des valeurs) gardent un seul état par cellule et suppriment les états approximativement
+    dominés. La dominance entre cellules étant transitive, tout état supprimé est couvert à delta près
+    par un état gardé
+    '''
+    with np.errstate(divide="ignore"):
+        return np.where(vals > 0, np.floor(np.log(vals) / log_delta), -1).astype(np.int64)
+
+def pareto_dp(instance, verbose=False, dominance="bucket", lorenz_bound=False, solutions=False, memory_budget=None,
+              offset=None, trace=None, epsilon=None, checkpoint=None, checkpoint_interval=60):
+    '''
+    dominance: "bucket" -> on ne compare que les vecteurs de même poids (dp[w])
+               "weight" -> le poids est un critère de plus à minimiser : on supprime aussi
+                           les états dominés par un état plus léger (ils ne servent à rien).
+                           Pour p = 2, même filtre que "bucket" (cf. _filtre)
+    lorenz_bound: si True, on supprime les états dont la borne de complétion est Lorenz dominée
+                  par une solution réalisable déjà connue. Tous les points Lorenz non dominés
+                  sont conservés mais le front de Pareto renvoyé est alors incomplet
+    solutions: si True, renvoie aussi la sélection d'objets de chaque point (tableau de bitsets, cf. selection)
+    memory_budget: si donné (en octets), les tables qui ne tiennent pas dans ce budget sont
+                   écrites sur disque et traitées par tranches de poids (cf. hors_memoire.py)
+    offset: vecteur objectif de l'état initial (objets déjà fixés dans le sac, cf. preprocessing.py)
+    trace: tracing.Trace optionnelle, reçoit une ligne de statistiques par objet
+    epsilon: mode approché, après r <= NB_ARRONDIS objets (tous les ceil(n / NB_ARRONDIS) objets), le filtre de
+             dominance est appliqué aux cellules d'une grille géométrique de raison delta = (1+epsilon)^(1/r)
+             (cf. _cellules) : par poids, puis aussi entre poids avec "weight" (p > 2).
+             Chaque arrondi perd au plus un facteur delta : pour tout point Pareto non dominé y, le résultat
+             contient y' >= y / (1+epsilon) (composante par composante).
+             Quelques arrondis sur une grille grossière suppriment bien plus d'états qu'un arrondi par objet
+             sur une grille de raison (1+epsilon)^(1/n)
+    checkpoint: fichier .npz de reprise (indice du prochain objet et table courante). S'il existe, on repart
+                de cette table, sinon il est créé. Il est mis à jour au plus toutes les checkpoint_interval
+                secondes, et supprimé à la fin. Le résultat est le même qu'en une seule exécution
+    Pour p = 2, les dp[w] sont gardés triés et fusionnés en temps linéaire (cf. biobjectif.py)
+    '''
+    if epsilon is not None and (lorenz_bound or memory_budget is not None):
+        raise ValueError("Le mode approché (epsilon) n'est pas disponible avec lorenz_bound ni memory_budget")
+    if memory_budget is not None:
+        if checkpoint is not None:
+            raise ValueError("Hors mémoire : pas de point de reprise")
+        if dominance != "bucket" or lorenz_bound or solutions:
+            raise ValueError("Hors mémoire : seul le filtre \"bucket\" est disponible (sans lorenz_bound ni solutions)")
+        from hors_memoire import pareto_dp_hors_memoire # importe indirecte
+        return pareto_dp_hors_memoire(instance, memory_budget, verbose, offset=offset, trace=trace)
+
     W = instance.capacity
     p = instance.p
 
-    # dp[w] = liste des vecteurs objectifs Pareto non dominés avec poids w
-    dp = [[] for _ in range(W+1)]
-    dp[0] = [tuple([0]*p)]
+    # dp[w] = vecteurs objectifs Pareto non dominés avec poids w (format CSR, cf. plus haut)
+    poids = np.zeros(1, dtype=np.int64)
+    debut = np.array([0, 1], dtype=np.int64)
+    vals = np.zeros((1, p), dtype=np.int64)
+    if offset is not None:
+        vals[0] = offset
+    if solutions:
+        # Sélection de chaque état : un bit par objet (n/8 octets par état, même indexation que vals)
+        bits = np.zeros((1, (instance.n + 7) // 8), dtype=np.uint8)
 
-    for i in range(instance.n):
+    if lorenz_bound:
+        bornes = BornesCompletion(instance)
+        front_lorenz = maj_front_lorenz(np.zeros((0, p), dtype=np.int64), solutions_gloutonnes(instance))
+    if epsilon is not None:
+        periode = -(-instance.n // NB_ARRONDIS)
+        log_delta = np.log1p(epsilon) / (instance.n // periode)
+
+    depart = 0
+    if checkpoint is not None:
+        meta = {"instance": instance.digest(), "dominance": dominance, "lorenz_bound": lorenz_bound,
+                "solutions": solutions, "epsilon": epsilon, "offset": offset}
+        reprise = lit_npz(checkpoint, meta)
+        if reprise is not None:
+            depart = int(reprise["objet"])
+            poids, debut, vals = reprise["poids"], reprise["debut"], reprise["vals"]
+            if solutions:
+                bits = reprise["bits"]
+            if lorenz_bound:
+                front_lorenz = reprise["front_lorenz"]
+            if verbose:
+                print(f"Reprise de {checkpoint} à l'objet {depart}")
+        derniere_ecriture = time.perf_counter()
+
+    for i in range(depart, instance.n):
         if verbose:
-            print(f"Objet {i} -> {np.sum(len(dp[w]) for w in range(W+1))} points dans la table")
+            print(f"Objet {i} -> {len(vals)} points dans la table ({len(poids)} poids atteignables)")
+        if trace is not None:
+            t_objet = time.perf_counter()
 
         wi = instance.weights[i]
-        vi = instance.values[i]
+        vi = np.asarray(instance.values[i], dtype=np.int64)
+
+        # Décalage de tous les états où on peut prendre l'objet (w + wi <= W)
+        w_new, v_new, prend, n_anc = _decale(poids, debut, vals, wi, vi, W)
+        candidats = len(w_new)
+        if solutions:
+            b_pris = bits[prend]
+            b_pris[:, i >> 3] |= np.uint8(1 << (i & 7))
+            b_new = np.concatenate((bits, b_pris))
+
+        if lorenz_bound:
+            # Les états sont des solutions réalisables : ils enrichissent le front connu.
+            # On supprime ceux dont toute complétion est Lorenz dominée par une solution connue
+            front_lorenz = maj_front_lorenz(front_lorenz, v_new)
+            U = bornes.borne(i + 1, v_new, W - w_new)
+            utile = ~lorenz_domine_strict(front_lorenz, lorenz_vectors(U))
+            w_new, v_new = w_new[utile], v_new[utile]
+            if solutions:
+                b_new = b_new[utile]
+            n_anc = int(utile[:n_anc].sum())
 
-        # Pour chaque poids où on pourrait prendre l'objet
-        for w in range(W - wi, -1, -1): # implique w + wi <= W
-            for v in dp[w]:
-                v_new = tuple(v[j] + vi[j] for j in range(p))
-                dp[w + wi] = pareto_insert(dp[w + wi], v_new)
+        if trace is not None:
+            t_filtre = time.perf_counter()
+        if epsilon is not None and (i + 1) % periode == 0:
+            # Filtres appliqués aux cellules de la grille (approché)
+            cellules = _cellules(v_new, log_delta)
+            garde = _filtre_groupes(w_new, cellules, trace)
+            if p == 2: # ordre attendu par filtre_groupes_bi à l'objet suivant
+                garde = garde[np.lexsort((-v_new[garde, 1], -v_new[garde, 0], w_new[garde]))]
+            elif dominance == "weight":
+                garde = _filtre_poids(cellules, garde, trace)
+        else:
+            garde = _filtre(w_new, v_new, n_anc, dominance, trace)
+        if trace is not None:
+            t_filtre = time.perf_counter() - t_filtre
+            octets = w_new.nbytes + v_new.nbytes + (b_new.nbytes if solutions else 0)
+
+        # double buffer : l'ancienne table est remplacée
+        w_new, vals = w_new[garde], v_new[garde]
+        if solutions:
+            bits = b_new[garde]
+        poids, debut = _table(w_new)
+        if trace is not None:
+            inseres = int((garde >= n_anc).sum())
+            trace.objet(objet=i, poids_objet=int(wi), candidats=candidats, elagues=candidats - len(v_new),
+                        inseres=inseres, supprimes=n_anc - (len(garde) - inseres), etats=len(vals),
+                        poids_atteignables=len(poids), temps=time.perf_counter() - t_objet, temps_filtre=t_filtre,
+                        octets=octets + vals.nbytes + w_new.nbytes)
+
+        if checkpoint is not None and time.perf_counter() - derniere_ecriture >= checkpoint_interval:
+            tableaux = dict(objet=i + 1, poids=poids, debut=debut, vals=vals)
+            if solutions:
+                tableaux["bits"] = bits
+            if lorenz_bound:
+                tableaux["front_lorenz"] = front_lorenz
+            ecrit_npz(checkpoint, meta, **tableaux)
+            derniere_ecriture = time.perf_counter()
 
     # On filtre toute les solutions trouvées
-    pareto_points = []
-    for w in range(W + 1): #pour tout les poids
-        for v in dp[w]:
-            pareto_points = pareto_insert(pareto_points, v)
+    if trace is not None:
+        t_fusion = time.perf_counter()
+    front = _front(vals)
+    if trace is not None:
+        trace.fusion = {"temps": time.perf_counter() - t_fusion, "etats": len(vals), "front": len(front)}
+    points = [tuple(v) for v in vals[front].tolist()]
+    if checkpoint is not None:
+        supprime(checkpoint)
+    if solutions:
+        return points, bits[front]
+    return points
 
-    return pareto_points
+def selection(bits):
+    '''
+    Indices des objets sélectionnés à partir d'un bitset (ligne renvoyée par pareto_dp(solutions=True))
+    '''
+    return np.flatnonzero(np.unpackbits(bits, bitorder="little")).tolist()
 
 #2ème étape : Filtre au sens de Lorenz
 
+def _lorenz_masque(points):
+    '''
+    Masque des points Lorenz non dominés
+    '''
+    if len(points) > 0 and len(points[0]) == 2:
+        return lorenz_masque_bi(points)
+
+    # Tous les vecteurs de Lorenz d'un coup, puis un seul filtre par tri
+    return lorenz_skyline(points)
+
 def lorenz_filter(points):
     '''
     Filtre les points pour ne garder que les Lorenz non dominés
     '''
-    lorenz_front = []
-    best_points = []
+    garde = _lorenz_masque(points)
+    return [p for p, g in zip(points, garde) if g]
 
-    # construction incrémentale du front de Lorenz
-    for p in points:
-        L = lorenz_vector(p)
-        lorenz_front = pareto_insert(lorenz_front, L)
+def methode_indirecte(instance, verbose=True, dominance="bucket", lorenz_bound=False, solutions=False, memory_budget=None,
+                      ordre=None, epsilon=None, checkpoint=None):
+    '''
+    solutions: si True, renvoie aussi la liste des sélections d'objets des points Lorenz non dominés
+               (gardées en bitsets pendant la programmation dynamique, décodées seulement pour ces points)
+    ordre: si donné, prétraitement des objets (objets fixés, puis ordre "file", "weight", "efficiency",
+           "rank_sum" ou "rank_max" des objets restants, cf. preprocessing.py)
+    epsilon: mode approché de pareto_dp. Pour tout point Lorenz non dominé y, les points Lorenz renvoyés
+             contiennent z avec L(z) >= L(y) / (1+epsilon) (cf. approximation.py)
+    checkpoint: fichier de reprise de pareto_dp
+    '''
+    options = dict(dominance=dominance, lorenz_bound=lorenz_bound, memory_budget=memory_budget, epsilon=epsilon,
+                   checkpoint=checkpoint)
+    pre = None
+    if ordre is not None:
+        pre = Pretraitement(instance, ordre)
+        instance = pre.instance
+        options["offset"] = pre.offset
 
-    # on garde les points dont le Lorenz est dans le front
-    lorenz_set = set(lorenz_front)
-    for p in points:
-        if lorenz_vector(p) in lorenz_set:
-            best_points.append(p)
+    if instance is None: # tous les objets sont fixés
+        pareto_points = [pre.offset]
+        bits = np.zeros((1, 0), dtype=np.uint8)
+    elif solutions:
+        pareto_points, bits = pareto_dp(instance, verbose, solutions=True, **options)
+    else:
+        pareto_points = pareto_dp(instance, verbose, **options)
+
+    if not solutions:
+        lorenz_points = lorenz_filter(pareto_points)
+        return pareto_points, lorenz_points
+
+    garde = _lorenz_masque(pareto_points)
+    lorenz_points = [y for y, g in zip(pareto_points, garde) if g]
+    lorenz_solutions = [selection(b) for b in bits[garde]]
+    if pre is not None:
+        lorenz_solutions = [pre.selection(s) for s in lorenz_solutions]
+    return pareto_points, lorenz_points, lorenz_solutions
+
+class IndirectSolver:
+    '''
+    Programmation dynamique incrémentale : on ajoute des objets au fur et à mesure (extend) et on peut
+    demander les fronts à tout moment, sans refaire les objets déjà traités
+
+        solver = IndirectSolver(capacity, p)
+        solver.extend(weights[:50], values[:50])
+        pareto_50 = solver.pareto(capacity_50)  # toute capacité <= capacity
+        solver.extend(weights[50:75], values[50:75])
+
+    capacity: capacité de la table. Les états de poids <= capacity sont tous gardés, les fronts
+              d'une capacité plus petite en sont extraits. Pour une capacité plus grande : rebuild
+    dominance: "bucket" ou "weight" (cf. pareto_dp)
+    '''
+    def __init__(self, capacity, p, dominance="bucket", offset=None):
+        self.capacity = int(capacity)
+        self.p = p
+        self.dominance = dominance
+        self.offset = offset
+        self.weights = np.zeros(0, dtype=np.int64)
+        self.values = np.zeros((0, p), dtype=np.int64)
+        self._vide()
+
+    def _vide(self):
+        self.poids = np.zeros(1, dtype=np.int64)
+        self.debut = np.array([0, 1], dtype=np.int64)
+        self.vals = np.zeros((1, self.p), dtype=np.int64)
+        if self.offset is not None:
+            self.vals[0] = self.offset
+
+    @property
+    def n(self):
+        return len(self.weights)
+
+    def _traite(self, weights, values):
+        for wi, vi in zip(weights.tolist(), values):
+            w_new, v_new, _, n_anc = _decale(self.poids, self.debut, self.vals, wi, vi, self.capacity)
+            garde = _filtre(w_new, v_new, n_anc, self.dominance)
+            w_new, self.vals = w_new[garde], v_new[garde]
+            self.poids, self.debut = _table(w_new)
+
+    def extend(self, weights, values):
+        '''
+        Ajoute les objets (weights (k,), values (k, p)) à la suite des objets déjà traités
+        '''
+        weights = np.asarray(weights, dtype=np.int64).reshape(-1)
+        values = np.asarray(values, dtype=np.int64).reshape(len(weights), self.p)
+        self._traite(weights, values)
+        self.weights = np.concatenate((self.weights, weights))
+        self.values = np.concatenate((self.values, values))
+
+    def rebuild(self, capacity):
+        '''
+        Change la capacité de la table : tous les objets sont traités à nouveau
+        '''
+        self.capacity = int(capacity)
+        self._vide()
+        self._traite(self.weights, self.values)
+
+    def _garde(self, capacity):
+        if capacity is None or capacity == self.capacity:
+            return self.vals
+        if capacity > self.capacity:
+            raise ValueError(f"Capacité {capacity} > capacité de la table {self.capacity} : il faut rebuild({capacity})")
+        return self.vals[:self.debut[np.searchsorted(self.poids, capacity, side="right")]]
 
-    return best_points
+    def pareto(self, capacity=None):
+        '''
+        Points Pareto non dominés avec les objets ajoutés jusqu'ici, pour un sac de capacité capacity
+        (par défaut celle de la table)
+        '''
+        vals = self._garde(capacity)
+        return [tuple(v) for v in vals[_front(vals)].tolist()]
 
-def methode_indirecte(instance, verbose=True):
-    pareto_points = pareto_dp(instance, verbose)
-    lorenz_points = lorenz_filter(pareto_points)
-    return pareto_points, lorenz_points
+    def lorenz(self, capacity=None):
+        '''
+        Points Lorenz non dominés, cf. pareto
+        '''
+        return lorenz_filter(self.pareto(capacity))
 
 # Tests
 if __name__ == "__main__":
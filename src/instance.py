@@ -4,35 +4,86 @@ et autre fonction utilitaire pour comparer ou tracer des solutions
 '''
 
 
+import os
+import glob
+import hashlib
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-def read_instance(filename, n, p):
+def _parse(filename):
     '''
-    n: nombre d'objets
-    p: nombre d'objectifs
+    Lit toutes les lignes "i poids v1 ... vP" du fichier
+    Renvoie un tableau (nb objets, 1 + P) : poids puis valeurs
     '''
-    weights = []
-    values = []
-
+    lignes = []
     with open(filename, "r") as f:
         for line in f:
             line = line.strip()
             if not line or line[0] != "i":
                 continue
-            data = line.split()
-            weights.append(int(data[1]))
-            values.append(tuple(map(int, data[2:2+p])))
-            
-            if len(weights) >= n:
-                break
+            lignes.append([int(x) for x in line.split()[1:]])
+    return np.array(lignes, dtype=np.int64).reshape(len(lignes), -1)
 
-    capacity = sum(weights) // 2
+_donnees = {} # (fichier, date de modification, taille) -> tableau déjà chargé
+
+def load_data(filename):
+    '''
+    Tableau (nb objets, 1 + P) de tout le fichier : poids puis valeurs (lecture seule)
+    Le premier appel écrit un cache binaire à côté du fichier (<fichier>.<hash>.npy) ;
+    les appels suivants le relisent par memory-map, sans analyser le texte
+    '''
+    info = os.stat(filename)
+    cle = (os.path.abspath(filename), info.st_mtime_ns, info.st_size)
+    if cle in _donnees:
+        return _donnees[cle]
+
+    with open(filename, "rb") as f:
+        h = hashlib.sha1(f.read()).hexdigest()[:16]
+    cache = f"{filename}.{h}.npy"
+    try:
+        donnees = np.load(cache, mmap_mode="r")
+    except (OSError, ValueError, EOFError):
+        donnees = _parse(filename)
+        try:
+            # Les caches d'une ancienne version du fichier ne servent plus
+            for ancien in glob.glob(glob.escape(filename) + ".*.npy"):
+                os.remove(ancien)
+            tmp = f"{cache}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, donnees)
+            os.replace(tmp, cache)
+            donnees = np.load(cache, mmap_mode="r")
+        except OSError: # dossier en lecture seule : on garde le tableau en mémoire
+            pass
+
+    _donnees[cle] = donnees
+    return donnees
+
+def read_instance(filename, n, p):
+    '''
+    n: nombre d'objets
+    p: nombre d'objectifs
+    (les n premiers objets et p premiers objectifs du fichier)
+    '''
+    donnees = load_data(filename)
+    weights = donnees[:n, 0]
+    values = donnees[:n, 1:1+p]
+
+    capacity = int(weights.sum()) // 2
 
     instance = Instance(weights, values, capacity)
 
     return instance
 
+def read_instances(filename, tailles):
+    '''
+    tailles: liste de (n, p)
+    Renvoie {(n, p): instance} pour toutes les tailles, à partir d'un seul chargement du fichier
+    '''
+    load_data(filename)
+    return {(n, p): read_instance(filename, n, p) for n, p in tailles}
+
 def random_instance(n, p, weight_range=(1, 100), value_range=(1, 100)):
     """
     Génère une instance aléatoire du sac à dos multiobjectifs
@@ -48,27 +99,75 @@ def random_instance(n, p, weight_range=(1, 100), value_range=(1, 100)):
     return instance
 
 class Instance:
+    '''
+    weights: tableau (n,) des poids, values: tableau (n, p) des valeurs (int64, contigus)
+    weights_list / values_list : mêmes données en listes Python (poids, tuples de valeurs)
+    '''
     def __init__(self, weights, values, capacity):
-        self.weights = weights
-        self.values = values
-        self.capacity = capacity
-        self.n = len(weights)
-        self.p = len(values[0])
+        self.weights = np.ascontiguousarray(weights, dtype=np.int64)
+        self.values = np.ascontiguousarray(values, dtype=np.int64).reshape(len(self.weights), -1)
+        self.capacity = int(capacity)
+        self.n = len(self.weights)
+        self.p = self.values.shape[1]
+        self._listes = None
+
+    def _en_listes(self):
+        if self._listes is None:
+            self._listes = (self.weights.tolist(), [tuple(v) for v in self.values.tolist()])
+        return self._listes
+
+    @property
+    def weights_list(self):
+        return self._en_listes()[0]
+
+    @property
+    def values_list(self):
+        return self._en_listes()[1]
+
+    def digest(self):
+        '''
+        Empreinte des données de l'instance (poids, valeurs, capacité), pour reconnaître une instance
+        (points de reprise, cache des résultats)
+        '''
+        h = hashlib.sha1()
+        h.update(np.array([self.n, self.p, self.capacity], dtype=np.int64).tobytes())
+        h.update(self.weights.tobytes())
+        h.update(self.values.tobytes())
+        return h.hexdigest()
 
     def eval(self, selec):
         '''
         selec: indices des objets séléctionnés
         évalue une selection d'objets d'une instance
         '''
-        w_sum = 0
-        val = np.zeros(self.p, dtype=int)
-        for i in selec:
-            w_sum += self.weights[i]
-            val += self.values[i]   
-        if w_sum > self.capacity:
+        idx = np.fromiter(selec, dtype=np.int64)
+        if self.weights[idx].sum() > self.capacity:
             return False
-        return tuple(val)
-    
+        return tuple(self.values[idx].sum(axis=0).tolist())
+
+    def eval_batch(self, selections):
+        '''
+        Évalue m sélections d'un coup
+        selections: matrice booléenne (m, n), ou bitsets (m, ceil(n/8)) uint8 (objet j -> bit j % 8 de l'octet j // 8)
+        Renvoie (realisable (m,), vecteurs objectifs (m, p), vecteurs de Lorenz (m, p))
+        '''
+        X = np.asarray(selections)
+        if X.dtype == np.uint8:
+            X = np.unpackbits(X, axis=1, count=self.n, bitorder="little")
+        X = X.astype(np.int64)
+        realisable = X @ self.weights <= self.capacity
+        y = X @ self.values
+        return realisable, y, lorenz_vectors(y)
+
+
+def selection_matrix(selections, n):
+    '''
+    Matrice booléenne (m, n) à partir de m listes d'indices d'objets (pour Instance.eval_batch)
+    '''
+    X = np.zeros((len(selections), n), dtype=bool)
+    for i, selec in enumerate(selections):
+        X[i, list(selec)] = True
+    return X
 
 def pareto_dominate(u, v):
     '''
@@ -103,6 +202,12 @@ def lorenz_vector(x):
 
     return tuple(L)
 
+def lorenz_vectors(points):
+    '''
+    Renvoie les vecteurs de Lorenz de tous les points (tableau (m, p)) d'un coup
+    '''
+    return np.cumsum(np.sort(np.asarray(points), axis=1), axis=1)
+
 def lorenz_dominate(u, v):
     '''
     return True si u domine v au sens de Lorenz
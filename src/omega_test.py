@@ -2,10 +2,12 @@
 Test l'influence du jeu de poids omega sur le temps de calcul dans la méthode direct
 '''
 
-from instance import read_instance
-from direct import enumerate_lorenz
-import time
+from instance import Instance
+from cache import resultat_directe
+from direct import EnumerationAnytime, enumerate_lorenz
+from runner import run_grid, tache
 import math
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 import csv
@@ -27,6 +29,82 @@ def omega_exp(p, lamb):
     omega = [math.exp(-lamb * k) for k in range(p)]
     return normalize(omega)
 
+LAMBDAS = [0.01, 0.1, 0.25, 0.4, 0.5, 0.6, 0.75, 1]
+MARGE_PILOTE = 1.5 # un pilote est arrêté au-delà de MARGE_PILOTE fois le meilleur temps (les temps courts sont bruités)
+
+def sous_instance(instance, k):
+    '''
+    Instance des k premiers objets (capacité : moitié de leur poids total, comme read_instance)
+    '''
+    weights = instance.weights[:k]
+    return Instance(weights, instance.values[:k], int(weights.sum()) // 2)
+
+def _pilote(instance, omega, budget):
+    '''
+    Temps de la méthode directe sur instance, inf si elle ne finit pas dans le budget
+    '''
+    enum = EnumerationAnytime(instance, omega, time_budget=budget)
+    start = time.perf_counter()
+    for _ in enum:
+        pass
+    temps = time.perf_counter() - start
+    return temps if enum.status == "complete" else math.inf
+
+def choix_lambda(instance, lambdas=LAMBDAS, fraction=1/3, budget=30, verbose=False):
+    '''
+    Choix automatique de lambda (omega = omega_exp(p, lambda)) pour la méthode directe, par des exécutions pilotes
+    - chaque lambda est essayé sur les n*fraction premiers objets, arrêté dès qu'il dépasse nettement le meilleur
+      temps déjà obtenu (MARGE_PILOTE) ou le budget (s)
+    - le temps sur l'instance complète est prédit par une loi puissance t = a * n^b, ajustée avec un
+      second pilote du meilleur lambda sur deux fois moins d'objets. C'est un ordre de grandeur : le temps
+      de la méthode directe ne croît pas régulièrement avec n (il dépend surtout du nb de points de Lorenz)
+    Renvoie un dict : lambda, omega, temps_predit (None si aucun pilote n'a fini), pilotes {lambda: temps}, temps_pilotes
+    '''
+    start = time.perf_counter()
+    p = instance.p
+    n2 = min(instance.n, max(2 * p, round(instance.n * fraction)))
+    n1 = max(1, n2 // 2)
+    pilote = sous_instance(instance, n2)
+
+    pilotes = {}
+    meilleur = budget
+    for lamb in lambdas:
+        pilotes[lamb] = t = _pilote(pilote, omega_exp(p, lamb), min(budget, MARGE_PILOTE * meilleur))
+        meilleur = min(meilleur, t)
+        if verbose:
+            print(f"Pilote lambda = {lamb} sur {n2} objets : {t:.3f}s")
+
+    lamb = min(pilotes, key=pilotes.get)
+    temps_predit = None
+    if math.isinf(pilotes[lamb]):
+        lamb = 0.5 # aucun pilote n'a fini : valeur par défaut
+    else:
+        t2 = pilotes[lamb]
+        t1 = _pilote(sous_instance(instance, n1), omega_exp(p, lamb), budget)
+        b = math.log(t2 / t1) / math.log(n2 / n1) if n1 < n2 and 0 < t1 < t2 else 1.0
+        temps_predit = t2 * (instance.n / n2) ** b
+
+    choix = {"lambda": lamb, "omega": omega_exp(p, lamb), "temps_predit": temps_predit,
+             "pilotes": pilotes, "temps_pilotes": time.perf_counter() - start}
+    if verbose:
+        predit = "?" if temps_predit is None else f"{temps_predit:.2f}s"
+        print(f"Lambda choisi : {lamb}, temps prédit {predit} (pilotes : {choix['temps_pilotes']:.2f}s)")
+    return choix
+
+def enumerate_lorenz_auto(instance, verbose=True, **options):
+    '''
+    Méthode directe avec lambda choisi par choix_lambda (options : cf. enumerate_lorenz)
+    Renvoie (points objectifs, vecteurs de Lorenz, choix), choix contient aussi le temps réel (temps)
+    '''
+    choix = choix_lambda(instance, verbose=verbose)
+    start = time.perf_counter()
+    y, L = enumerate_lorenz(instance, choix["omega"], False, **options)
+    choix["temps"] = time.perf_counter() - start
+    if verbose:
+        predit = "?" if choix["temps_predit"] is None else f"{choix['temps_predit']:.2f}s"
+        print(f"Temps prédit {predit}, temps réel {choix['temps']:.2f}s")
+    return y, L, choix
+
 
 def test_omega(instance, OMEGA):
     '''
@@ -39,14 +117,14 @@ def test_omega(instance, OMEGA):
         t = []
         for _ in range(3):  # on fait une moyenne sur 3 runs
             # print(f"{omega = }")
-            start = time.perf_counter()
-            dir,lor = enumerate_lorenz(instance, omega, verbose=False)
-            temps = time.perf_counter() - start
-            t.append(temps)
+            # Mesure de temps : toujours recalculé (bypass), le résultat est gardé pour les autres scripts
+            res = resultat_directe(instance, omega, bypass=True)
+            lor = res["lorenz_vectors"]
+            t.append(res["temps"])
         temps_moyen = np.mean(t)
         K = len(lor)
         print(f"Lambda {i} -> Temps : {temps_moyen:.3f}s, {K} vecteurs")
-        T.append(temps)
+        T.append(temps_moyen)
         
     return T
 
@@ -54,10 +132,11 @@ if __name__ == "__main__":
 
     P = [2,4,6]
     N = [[120,160,200], [45,60,75], [20,30,35]] #On prend des plus petites instance pour des p plus grand
-    lambdas = [0.01, 0.1, 0.25, 0.4, 0.5, 0.6, 0.75, 1]
+    lambdas = LAMBDAS
     res = {}
 
     print(f"On va tester les lambdas suivant : {lambdas}")
+    taches = []
 
     for i, p in enumerate(P):
         print("---"*15)
@@ -69,18 +148,26 @@ if __name__ == "__main__":
             omegas.append(omega)
             print(f"Lamba {j} = {l} -> omega = {[round(o,3) for o in omega]}")
         for n in N[i]:
-            print("---"*15)
-            print(f"{n = }")
-            print("---"*15)
-            instance = read_instance("Data/2KP200-TA-0.dat", n, p)
-            T = test_omega(instance, omegas)
-            res[p , n] = T
+            for j, omega in enumerate(omegas):
+                for rep in range(3): # on fait une moyenne sur 3 runs
+                    taches.append(tache(p, n, "directe", lambdas[j], omega, rep))
+
+    # Chaque run dans son propre processus, 5 min max par run, résultats ajoutés au CSV au fur et à mesure
+    lignes = run_grid(taches, "Data/2KP200-TA-0.dat", timeout=300, csv_path="Resultats/Omega/runs_omega.csv")
+    for l in lignes:
+        temps = l["temps"] if l["statut"] == "ok" else float("nan")
+        res.setdefault((l["p"], l["n"]), {}).setdefault(l["lambda"], []).append(temps)
+    # Temps moyen par lambda (nan si un des runs n'a pas abouti)
+    res = {cle: [np.mean(par_lambda[l]) for l in lambdas] for cle, par_lambda in res.items()}
 
     print("---"*15)
     print("RESULTATS")
     print("---"*15)
     for p,n in res.keys():
-        print(f"{p=}, {n=} -> meilleur lambda = {lambdas[np.argmin(res[p,n])]}")
+        if np.isnan(res[p,n]).all():
+            print(f"{p=}, {n=} -> aucun run n'a abouti")
+        else:
+            print(f"{p=}, {n=} -> meilleur lambda = {lambdas[np.nanargmin(res[p,n])]}")
 
     #Plot
     for p in P:
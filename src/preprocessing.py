@@ -0,0 +1,131 @@
+'''
+Prétraitement des objets avant la programmation dynamique de la méthode indirecte
+
+(1) Objets fixés (aucun point Pareto non dominé n'est perdu) :
+    - hors du sac : poids > capacité, valeurs toutes nulles, ou objet i dominé par des objets D_i
+      (w_j <= w_i et v_j >= v_i) trop lourds avec lui : w_i + w(D_i) > W.
+      Dans une solution qui contient i sans un j de D_i, on peut remplacer i par j sans perdre :
+      tout point a donc une solution où i n'apparaît qu'avec tout D_i, ce qui est impossible.
+    - dans le sac : si tous les objets restants tiennent ensemble dans le sac
+(2) Ordre des objets restants dans la programmation dynamique, qui change la taille des tables
+    intermédiaires (pas le résultat) :
+    - "file" : ordre du fichier
+    - "weight" : poids croissant
+    - "efficiency" : efficacité (somme des valeurs / poids) décroissante
+    - "rank_sum" : somme des rangs d'efficacité (v_k / w) sur les objectifs, meilleurs d'abord
+    - "rank_max" : plus mauvais rang d'efficacité sur les objectifs, meilleurs d'abord
+'''
+
+import time
+
+import numpy as np
+
+from instance import Instance, read_instance
+from tracing import Trace
+
+ORDRES = ["file", "weight", "efficiency", "rank_sum", "rank_max"]
+
+def objets_fixes(instance):
+    '''
+    Renvoie (dedans, dehors) : indices des objets fixés dans le sac et hors du sac
+    '''
+    W = instance.capacity
+    w = np.asarray(instance.weights, dtype=np.int64)
+    v = np.asarray(instance.values, dtype=np.int64)
+
+    dehors = (w > W) | (v == 0).all(axis=1)
+
+    # dom[j, i] : j domine i (au moins aussi léger, valeurs au moins aussi bonnes, différent)
+    dom = w[:, None] <= w[None, :]
+    for k in range(instance.p):
+        dom &= v[:, None, k] >= v[None, :, k]
+    dom &= (w[:, None] != w[None, :]) | (v[:, None, :] != v[None, :, :]).any(axis=2)
+    dehors |= w + w @ dom > W
+
+    libres = np.flatnonzero(~dehors)
+    dedans = libres if w[libres].sum() <= W else np.zeros(0, dtype=np.int64)
+    return dedans.tolist(), np.flatnonzero(dehors).tolist()
+
+def ordonne(instance, objets, ordre="file"):
+    '''
+    Trie les objets (indices) selon la stratégie ordre (cf. ORDRES)
+    '''
+    if ordre not in ORDRES:
+        raise ValueError(f"Ordre inconnu : {ordre} (possibles : {ORDRES})")
+    objets = np.asarray(objets, dtype=np.int64)
+    if ordre == "file" or len(objets) == 0:
+        return objets.tolist()
+
+    w = np.asarray(instance.weights, dtype=np.int64)[objets]
+    v = np.asarray(instance.values, dtype=np.int64)[objets]
+    if ordre == "weight":
+        cle = w
+    elif ordre == "efficiency":
+        cle = -v.sum(axis=1) / w
+    else:
+        # Rang de chaque objet pour l'efficacité de chaque objectif (0 : le plus efficace)
+        rangs = np.argsort(np.argsort(-(v / w[:, None]), axis=0, kind="stable"), axis=0, kind="stable")
+        cle = rangs.sum(axis=1) if ordre == "rank_sum" else rangs.max(axis=1)
+    return objets[np.argsort(cle, kind="stable")].tolist()
+
+class Pretraitement:
+    '''
+    Instance réduite aux objets libres (dans l'ordre choisi), à résoudre en partant de offset
+    '''
+    def __init__(self, instance, ordre="file"):
+        self.dedans, self.dehors = objets_fixes(instance)
+        fixes = set(self.dedans) | set(self.dehors)
+        self.ordre = ordonne(instance, [j for j in range(instance.n) if j not in fixes], ordre)
+
+        self.capacity = instance.capacity - int(instance.weights[self.dedans].sum())
+        self.offset = tuple(instance.values[self.dedans].sum(axis=0).tolist())
+        self.instance = None # aucun objet libre
+        if self.ordre:
+            self.instance = Instance(instance.weights[self.ordre], instance.values[self.ordre], self.capacity)
+
+    def selection(self, objets):
+        '''
+        Indices (dans l'instance d'origine) d'une sélection d'objets de l'instance réduite
+        '''
+        return sorted(self.dedans + [self.ordre[j] for j in objets])
+
+def compare(instance, ordres=ORDRES, plot=False):
+    '''
+    Lance la programmation dynamique avec chaque ordre et affiche la taille des tables intermédiaires
+    Renvoie {ordre: liste des tailles de la table après chaque objet}
+    '''
+    from indirecte import pareto_dp # indirecte importe ce module
+
+    tailles = {}
+    print(f"{'ordre':<12} {'fixés in/out':>13} {'max table':>10} {'total':>10} {'temps':>8} {'#pareto':>8}")
+    for ordre in ordres:
+        pre = Pretraitement(instance, ordre)
+        trace = Trace()
+        start = time.perf_counter()
+        points = pareto_dp(pre.instance, offset=pre.offset, trace=trace) if pre.instance else [pre.offset]
+        temps = time.perf_counter() - start
+        tailles[ordre] = stats = trace.colonne("etats")
+        print(f"{ordre:<12} {len(pre.dedans):>6}/{len(pre.dehors):<6} {max(stats, default=1):>10} "
+              f"{sum(stats):>10} {temps:>7.2f}s {len(points):>8}")
+
+    if plot:
+        import matplotlib.pyplot as plt
+        plt.figure()
+        for ordre, stats in tailles.items():
+            plt.plot(range(1, len(stats) + 1), stats, label=ordre)
+        plt.xlabel("Objets traités")
+        plt.ylabel("Nombre d'états dans la table")
+        plt.title("Taille de la table selon l'ordre des objets")
+        plt.legend()
+        plt.grid(True)
+        plt.tight_layout()
+        plt.show()
+
+    return tailles
+
+if __name__ == "__main__":
+
+    for n, p in [(100, 2), (40, 3), (30, 4), (25, 5), (20, 6)]:
+        print("---"*15)
+        print(f"{n = }, {p = }")
+        compare(read_instance("Data/2KP200-TA-0.dat", n, p))
@@ -0,0 +1,225 @@
+'''
+Exécution d'une grille d'expériences (comparaison.py, omega_test.py) dans des processus séparés
+
+- chaque (configuration, méthode, répétition) est une tâche exécutée dans son propre processus,
+  au plus `workers` en même temps
+- les données du fichier d'instances sont lues une seule fois et partagées avec les processus
+  par mémoire partagée (chaque tâche n'en garde que ses n premiers objets et p premiers objectifs)
+- une tâche qui dépasse son budget de temps est arrêtée et enregistrée comme "timeout"
+- chaque résultat est écrit dans le CSV dès qu'il arrive (format long : une ligne par tâche),
+  un arrêt en cours de grille ne perd pas les résultats déjà obtenus
+- méthode "indirecte_incrementale" : une seule tâche pour plusieurs tailles n (même p), la table de la
+  programmation dynamique est étendue de taille en taille (indirecte.IndirectSolver). Une ligne par taille,
+  écrite dès que la taille est traitée, avec le temps de l'étape (temps) et le temps depuis le début (temps_cumule).
+  Le timeout porte sur toute la tâche, les tailles non atteintes ont le statut de la tâche
+'''
+
+import os
+import csv
+import time
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from instance import load_data, Instance
+
+CHAMPS = ["p", "n", "lambda", "methode", "rep", "statut", "temps", "pareto_count", "lorenz_count", "temps_cumule"]
+
+def tache(p, n, methode, lamb=None, omega=None, rep=0, tailles=None):
+    '''
+    Une tâche de la grille : une méthode ("indirecte", "directe" ou "indirecte_incrementale") sur l'instance (n, p)
+    omega: poids OWA de la méthode directe (lamb est seulement recopié dans le CSV)
+    tailles: tailles n de "indirecte_incrementale" (n est alors la plus grande)
+    '''
+    if tailles is not None:
+        n = max(tailles)
+    return {"p": p, "n": n, "lambda": lamb, "omega": omega, "methode": methode, "rep": rep, "tailles": tailles}
+
+def _partage(file):
+    '''
+    Copie les données du fichier dans un bloc de mémoire partagée
+    tableau (nb objets, 1 + nb objectifs) : poids puis valeurs (cf. instance.load_data)
+    '''
+    donnees = load_data(file)
+    shm = shared_memory.SharedMemory(create=True, size=donnees.nbytes)
+    np.ndarray(donnees.shape, dtype=np.int64, buffer=shm.buf)[:] = donnees
+    return shm, donnees.shape
+
+def _instance_partagee(nom, forme, n, p):
+    '''
+    Instance (n, p) reconstruite dans un processus à partir de la mémoire partagée
+    (même capacité que read_instance)
+    '''
+    shm = shared_memory.SharedMemory(name=nom)
+    try:
+        donnees = np.ndarray(forme, dtype=np.int64, buffer=shm.buf)
+        weights = donnees[:n, 0].copy() # copies : le bloc est fermé juste après
+        values = donnees[:n, 1:1+p].copy()
+    finally:
+        shm.close()
+    return Instance(weights, values, int(weights.sum()) // 2)
+
+def _indirecte(instance, t, etape):
+    from indirecte import methode_indirecte
+    par, lor = methode_indirecte(instance, False)
+    return {"pareto_count": len(par), "lorenz_count": len(lor)}
+
+def _directe(instance, t, etape):
+    from direct import enumerate_lorenz
+    y, _ = enumerate_lorenz(instance, t["omega"], verbose=False)
+    return {"lorenz_count": len(y)}
+
+def _indirecte_incrementale(instance, t, etape):
+    '''
+    Toutes les tailles de t["tailles"] avec une seule programmation dynamique : instance est la plus grande,
+    le front de chaque taille n est extrait pour la capacité de l'instance à n objets (cf. _instance_partagee)
+    '''
+    from indirecte import IndirectSolver, lorenz_filter
+    solver = IndirectSolver(instance.capacity, instance.p)
+    start = time.perf_counter()
+    for n in sorted(t["tailles"]):
+        debut = time.perf_counter()
+        solver.extend(instance.weights[solver.n:n], instance.values[solver.n:n])
+        par = solver.pareto(int(instance.weights[:n].sum()) // 2)
+        lor = lorenz_filter(par)
+        fin = time.perf_counter()
+        etape({"n": n, "temps": fin - debut, "temps_cumule": fin - start,
+               "pareto_count": len(par), "lorenz_count": len(lor)})
+    return {}
+
+METHODES = {"indirecte": _indirecte, "directe": _directe, "indirecte_incrementale": _indirecte_incrementale}
+
+def _travail(nom, forme, i, t, sortie):
+    '''
+    Corps d'un processus : exécute la tâche i et envoie son résultat
+    Le temps n'est compté qu'une fois l'instance chargée ("debut")
+    '''
+    try:
+        instance = _instance_partagee(nom, forme, t["n"], t["p"])
+        sortie.put(("debut", i, None))
+        start = time.perf_counter()
+        res = METHODES[t["methode"]](instance, t, lambda r: sortie.put(("etape", i, r)))
+        res["temps"] = time.perf_counter() - start
+        sortie.put(("fin", i, res))
+    except Exception as e:
+        sortie.put(("erreur", i, repr(e)))
+
+class _Ecrivain:
+    '''
+    Ajoute les lignes au CSV au fur et à mesure (en-tête écrit seulement si le fichier est nouveau,
+    sinon on garde les colonnes du fichier existant)
+    '''
+    def __init__(self, path):
+        self.f = None
+        if path is not None:
+            nouveau = not os.path.exists(path) or os.path.getsize(path) == 0
+            champs = CHAMPS
+            if not nouveau:
+                with open(path, newline="") as f:
+                    champs = next(csv.reader(f), None) or CHAMPS
+            self.f = open(path, "a", newline="")
+            self.writer = csv.DictWriter(self.f, fieldnames=champs, extrasaction="ignore")
+            if nouveau:
+                self.writer.writeheader()
+                self.f.flush()
+
+    def ecrit(self, ligne):
+        if self.f is not None:
+            self.writer.writerow(ligne)
+            self.f.flush()
+
+    def ferme(self):
+        if self.f is not None:
+            self.f.close()
+
+def run_grid(taches, file="Data/2KP200-TA-0.dat", workers=None, timeout=None, csv_path=None, verbose=True):
+    '''
+    Exécute toutes les tâches (cf. tache()) et renvoie une ligne (dict, colonnes CHAMPS) par tâche,
+    dans l'ordre des tâches. Pour "indirecte_incrementale", la ligne contient aussi "etapes" : une ligne par taille
+    workers: nb de processus en même temps (par défaut le nb de coeurs)
+    timeout: budget en secondes par tâche (None : pas de limite), une tâche arrêtée a le statut "timeout"
+             et pas de temps
+    csv_path: CSV auquel chaque ligne est ajoutée dès que la tâche se termine
+    '''
+    workers = workers or os.cpu_count()
+    ctx = multiprocessing.get_context("spawn") # les solveurs ne supportent pas fork
+    sortie = ctx.Queue()
+    shm, forme = _partage(file)
+    ecrivain = _Ecrivain(csv_path)
+
+    lignes = [None] * len(taches)
+    a_lancer = list(range(len(taches)))[::-1]
+    actifs = {} # i -> [processus, instant de début du calcul ou None]
+    etapes = {i: [] for i, t in enumerate(taches) if t.get("tailles") is not None}
+
+    def ecrit(t, statut, res):
+        ligne = {c: t.get(c) for c in CHAMPS}
+        ligne["statut"] = statut
+        ligne.update(res or {})
+        for c in ("temps", "temps_cumule"):
+            if ligne[c] is not None:
+                ligne[c] = round(ligne[c], 3)
+        ecrivain.ecrit(ligne)
+        if verbose:
+            print(f"p={t['p']}, n={ligne['n']}, lambda={t['lambda']}, {t['methode']} (run {t['rep']}) : {statut}"
+                  + (f" en {ligne['temps']:.2f}s" if statut == "ok" else ""))
+        return ligne
+
+    def termine(i, statut, res=None):
+        t = taches[i]
+        if i in etapes:
+            # Tailles non atteintes : statut de la tâche (timeout, erreur)
+            faites = {ligne["n"] for ligne in etapes[i]}
+            for n in sorted(t["tailles"]):
+                if n not in faites:
+                    etapes[i].append(ecrit(t, statut, {"n": n}))
+            ligne = {c: t.get(c) for c in CHAMPS}
+            ligne.update(statut=statut, etapes=sorted(etapes[i], key=lambda l: t["tailles"].index(l["n"])))
+        else:
+            ligne = ecrit(t, statut, res)
+        lignes[i] = ligne
+        proc = actifs.pop(i)[0]
+        proc.join()
+
+    try:
+        while a_lancer or actifs:
+            while a_lancer and len(actifs) < workers:
+                i = a_lancer.pop()
+                proc = ctx.Process(target=_travail, args=(shm.name, forme, i, taches[i], sortie), daemon=True)
+                proc.start()
+                actifs[i] = [proc, None]
+
+            try:
+                msg, i, res = sortie.get(timeout=0.1)
+                if i not in actifs: # tâche déjà arrêtée (timeout)
+                    pass
+                elif msg == "debut":
+                    actifs[i][1] = time.perf_counter()
+                elif msg == "etape":
+                    etapes[i].append(ecrit(taches[i], "ok", res))
+                elif msg == "fin":
+                    termine(i, "ok", res)
+                else:
+                    if verbose:
+                        print(res)
+                    termine(i, "erreur")
+            except queue.Empty:
+                pass
+
+            now = time.perf_counter()
+            for i, (proc, debut) in list(actifs.items()):
+                if timeout is not None and debut is not None and now - debut > timeout:
+                    proc.terminate()
+                    termine(i, "timeout")
+                elif not proc.is_alive() and proc.exitcode != 0: # processus tué (mémoire...)
+                    termine(i, "erreur")
+    finally:
+        for proc, _ in actifs.values():
+            proc.terminate()
+        ecrivain.ferme()
+        shm.close()
+        shm.unlink()
+
+    return lignes
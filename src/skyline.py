@@ -0,0 +1,74 @@
+'''
+Filtre de Pareto en un seul passage sur tout un ensemble de points (skyline, maximisation)
+
+Algorithme par tri (sort-filter-skyline avec l'arrêt anticipé de SaLSa) :
+- les points sont triés par plus grande composante décroissante puis somme décroissante,
+  un point ne peut donc être dominé que par un point placé avant lui
+- on les compare par blocs à la fenêtre des points déjà gardés (qui sont tous dans le front)
+- dès qu'un point gardé a sa plus petite composante >= à la plus grande composante du point courant,
+  tous les points restants sont dominés et on s'arrête
+'''
+
+import numpy as np
+
+from instance import lorenz_vectors
+
+TAILLE_BLOC = 256 # nombre de points comparés à la fenêtre à la fois
+
+def _domine_faible(a, b):
+    '''
+    Matrice (len(a), len(b)) : a[i] >= b[j] composante par composante
+    '''
+    dom = np.ones((len(a), len(b)), dtype=bool)
+    for j in range(a.shape[1]):
+        dom &= a[:, j, None] >= b[None, :, j]
+    return dom
+
+def skyline(points):
+    '''
+    points: tableau (m, p)
+    Renvoie les indices des points non dominés (un seul exemplaire des doublons)
+    '''
+    V = np.asarray(points)
+    if len(V) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    _, uniques = np.unique(V, axis=0, return_index=True)
+    U = V[uniques]
+    ordre = np.lexsort((-U.sum(axis=1), -U.max(axis=1)))
+    U, uniques = U[ordre], uniques[ordre]
+    maxi = U.max(axis=1)
+
+    garde = np.zeros(len(U), dtype=bool)
+    fenetre = np.zeros((0, U.shape[1]), dtype=U.dtype)
+    seuil = None # plus grande "plus petite composante" des points gardés
+    for b0 in range(0, len(U), TAILLE_BLOC):
+        # Arrêt anticipé : tout point dont la plus grande composante est <= seuil est dominé
+        if seuil is not None and maxi[b0] <= seuil:
+            break
+        bloc = U[b0:b0 + TAILLE_BLOC]
+        domine = _domine_faible(fenetre, bloc).any(axis=0)
+        domine |= np.triu(_domine_faible(bloc, bloc), 1).any(axis=0) # points distincts -> stricte
+        if seuil is not None:
+            domine |= maxi[b0:b0 + TAILLE_BLOC] <= seuil
+        garde[b0:b0 + TAILLE_BLOC] = ~domine
+        nouveaux = bloc[~domine]
+        if len(nouveaux):
+            fenetre = np.concatenate((fenetre, nouveaux))
+            s = int(nouveaux.min(axis=1).max())
+            seuil = s if seuil is None else max(seuil, s)
+
+    return uniques[garde]
+
+def lorenz_skyline(points):
+    '''
+    Masque des points dont le vecteur de Lorenz est non dominé
+    (tous les points ayant le même vecteur de Lorenz sont gardés)
+    '''
+    if len(points) == 0:
+        return np.zeros(0, dtype=bool)
+    L = lorenz_vectors(points)
+    uniques, inverse = np.unique(L, axis=0, return_inverse=True)
+    dans_front = np.zeros(len(uniques), dtype=bool)
+    dans_front[skyline(uniques)] = True
+    return dans_front[inverse.ravel()]
@@ -1,32 +1,47 @@
 from instance import read_instance, plot_2d_points
-from indirecte import methode_indirecte
-from direct import enumerate_lorenz
-from omega_test import omega_exp
-import time
+from cache import resultat_indirecte, resultat_directe
+from omega_test import choix_lambda
 
-def test_comp(n,p,omega, verbose=True, file="Data/2KP200-TA-0.dat"):
+def _origine(res):
+    return " (résultat du cache)" if res["cache"] else ""
+
+def test_comp(n,p,omega, verbose=True, file="Data/2KP200-TA-0.dat", bypass=True):
+    '''
+    omega: poids OWA de la méthode directe, ou "auto" (choisis par des exécutions pilotes, cf. omega_test.choix_lambda)
+    bypass: si True (par défaut), les 2 méthodes sont recalculées et chronométrées, leurs résultats sont
+            enregistrés dans le cache pour les autres scripts (cf. cache.py).
+            Si False, on relit les résultats du cache quand ils existent (temps du calcul d'origine)
+    '''
 
     instance = read_instance(file, n, p)
 
     print("---"*15)
     print(f"Test sur une instance de {n} objet et {p} objectifs")
+    choix = None
+    if omega == "auto":
+        choix = choix_lambda(instance, verbose=verbose)
+        omega = choix["omega"]
     print(f"Omega = {[round(o,3) for o in omega]}")
     print("---"*15)
 
     print("Méthode indirecte :")
-    start = time.time()
-    par, ind = methode_indirecte(instance, verbose)
-    temps_indirecte = time.time() - start
-    print(f"On trouve {len(par)} points Pareto et {len(ind)} points Lorenz en {temps_indirecte:.2f}s")
+    res = resultat_indirecte(instance, bypass, verbose=verbose)
+    par, ind, temps_indirecte = res["pareto"], res["lorenz"], res["temps"]
+    print(f"On trouve {len(par)} points Pareto et {len(ind)} points Lorenz en {temps_indirecte:.2f}s{_origine(res)}")
     print(ind)
 
     print("---"*15)
     print("Méthode directe:")
     print(f"{omega = }")
-    start = time.time()
-    dir,lor = enumerate_lorenz(instance, omega, verbose)
-    temps_directe = time.time() - start
-    print(f"On trouve {len(dir)} points en {temps_directe:.2f}s")
+    # Avec omega choisi automatiquement, on mesure toujours le temps réel (comparé au temps prédit)
+    res = resultat_directe(instance, omega, bypass or choix is not None, verbose=verbose)
+    dir, temps_directe = res["objective_points"], res["temps"]
+    if temps_directe is None: # relu du cache, calculé avec un autre omega
+        print(f"On trouve {len(dir)} points (résultat du cache, calculé avec un autre omega : pas de temps)")
+    else:
+        print(f"On trouve {len(dir)} points en {temps_directe:.2f}s{_origine(res)}")
+    if choix is not None and choix["temps_predit"] is not None:
+        print(f"(lambda = {choix['lambda']}, temps prédit {choix['temps_predit']:.2f}s)")
     print(dir)
     
     print("---"*15)
@@ -78,7 +93,7 @@ if __name__ == "__main__":
     while True:
         raw = input("Omega (p valeurs, ex: 0.2,0.5,0.9) ou auto: ").strip()
         if raw == "" or raw.lower() in {"auto", "a"}:
-            omega = omega_exp(p, 0.5)
+            omega = "auto"
             break
         parts = [s.strip() for s in raw.replace(";", ",").split(",") if s.strip() != ""]
         if len(parts) != p:
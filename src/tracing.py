@@ -0,0 +1,93 @@
+'''
+Trace de la programmation dynamique de la méthode indirecte : une ligne par objet traité
+
+    trace = Trace()
+    pareto_dp(instance, trace=trace)
+    trace.to_csv("Resultats/Traces/trace.csv")
+
+Sans trace (trace=None), pareto_dp ne fait aucun calcul supplémentaire.
+'''
+
+import os
+import csv
+import json
+import time
+
+from instance import read_instance
+
+CHAMPS = [
+    "objet",              # indice de l'objet
+    "poids_objet",
+    "candidats",          # états avant filtrage (anciens + décalés)
+    "elagues",            # états supprimés par la borne de Lorenz (lorenz_bound)
+    "comparaisons",       # comparaisons de dominance faites par le filtre
+    "inseres",            # nouveaux états (objet pris) gardés
+    "supprimes",          # anciens états supprimés (dominés par un nouvel état)
+    "etats",              # états de la table après l'objet
+    "poids_atteignables",
+    "temps",              # temps total pour l'objet (s)
+    "temps_filtre",       # dont filtre de dominance (s)
+    "octets",             # mémoire approchée : tableaux des candidats et de la nouvelle table
+]
+
+class Trace:
+    '''
+    Enregistre une ligne (dict, colonnes CHAMPS) par objet
+    callback: fonction optionnelle appelée avec chaque ligne dès qu'elle est enregistrée
+    '''
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.lignes = []
+        self.fusion = {} # fusion finale des dp[w] (temps, états, taille du front)
+        self.comparaisons = 0 # compteur de l'objet en cours, incrémenté par les filtres
+
+    def objet(self, **ligne):
+        ligne["comparaisons"] = self.comparaisons
+        self.comparaisons = 0
+        self.lignes.append(ligne)
+        if self.callback is not None:
+            self.callback(ligne)
+
+    def colonne(self, nom):
+        return [l[nom] for l in self.lignes]
+
+    def resume(self):
+        '''
+        Totaux et maxima sur tous les objets
+        '''
+        res = {c: sum(self.colonne(c)) for c in ["candidats", "elagues", "comparaisons", "inseres", "supprimes", "temps", "temps_filtre"]}
+        res["max_etats"] = max(self.colonne("etats"), default=0)
+        res["max_octets"] = max(self.colonne("octets"), default=0)
+        res["fusion"] = self.fusion
+        return res
+
+    def to_csv(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CHAMPS)
+            writer.writeheader()
+            writer.writerows(self.lignes)
+
+    def to_json(self, path, **meta):
+        '''
+        meta: informations ajoutées au fichier (n, p, options...)
+        '''
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"meta": meta, "resume": self.resume(), "objets": self.lignes}, f, indent=1)
+
+if __name__ == "__main__":
+
+    from indirecte import pareto_dp
+
+    print(f"{'p':>2} {'n':>4} {'temps':>8} {'filtre':>8} {'comparaisons':>14} {'max états':>10} {'fusion':>8}")
+    for n, p in [(100, 2), (40, 3), (30, 4), (25, 5), (20, 6)]:
+        trace = Trace()
+        start = time.perf_counter()
+        pareto_dp(read_instance("Data/2KP200-TA-0.dat", n, p), trace=trace)
+        temps = time.perf_counter() - start
+        r = trace.resume()
+        print(f"{p:>2} {n:>4} {temps:>7.2f}s {r['temps_filtre']:>7.2f}s {r['comparaisons']:>14} "
+              f"{r['max_etats']:>10} {r['fusion']['temps']:>7.2f}s")
+        trace.to_csv(f"Resultats/Traces/trace_p{p}_n{n}.csv")
+        trace.to_json(f"Resultats/Traces/trace_p{p}_n{n}.json", n=n, p=p)